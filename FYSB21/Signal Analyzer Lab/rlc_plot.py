@@ -3,24 +3,25 @@
 # This software is licensed under the MIT license.
 # Read more at https://mit-license.org/.
 
-from matplotlib import pyplot as plt
+from lu_work import render, instrument
+from lu_work.render import pyplot as plt
 import numpy as np
-import pandas
+from sweep_cache import load_sweep
+from sweep_fit import fit_rlc
+from sweep_kernels import dbm_to_linear, normalize, rlc_response
 
 FILE_PATH = 'data/rlc_data.csv'
 INDUCTANCE_VALUE = 100*10**-9 # Value for L given by instruction manual.
 
-def parse_data(df, i):
-    header_index = df[df['Name']=='Frequency [Hz]'].index[0]
-    split_data = df[df.index > header_index]
-    split_data.columns = df.iloc[header_index]
-
-    to_float = lambda x: float(x.replace(',','.'))
-
-    freq_list = [to_float(x) for x in split_data['Frequency [Hz]'].tolist()]
-    gain_list = [to_float(x) for x in split_data['Magnitude [dBm]'].tolist()]
-
-    return freq_list[i:], gain_list[i:]
+@instrument.timed('parse_data')
+def parse_data(path, i):
+    '''
+    Reads the sweep in the analyzer CSV at `path` (see sweep_reader.py), or loads it
+    from the cache if it has been parsed before (see sweep_cache.py), and returns
+    the frequencies and gains (dBm) as arrays, leaving out the first i points.
+    '''
+    header, freq, gain = load_sweep(path)
+    return freq[i:], gain[i:]
 
 def norm_scatter(data, size=10, alpha=1):
     '''
@@ -30,41 +31,45 @@ def norm_scatter(data, size=10, alpha=1):
     a scatter plot of these normalized datapoints is generated.
     '''
     freq, gain_dbm = data
-    gain = [10**(sigma/10) for sigma in gain_dbm]
-    max_gain = max(gain)
-    normalized_gain = [gain/max_gain for gain in gain]
+    gain = dbm_to_linear(gain_dbm)
+    normalized_gain = normalize(gain, out=gain)
     plt.scatter(freq, normalized_gain, s=size, alpha=alpha,
                 label='Normalized gain datapoints', c='grey')
 
-def g(sigma, R, L, C):
-    return 1/np.sqrt(1 + ((1/R**2) * (1/(sigma*C) - (L*sigma))**2))
+# g(sigma) for the RLC circuit, which works on a whole array of sigma at once (see sweep_kernels.py).
+g = rlc_response
 
 def lorentz_fit(data, params):
     '''
     Using formula 2.100 from Franklin's Mathematical Methods for Oscillations
-    and Waves [2020], a plot of g(sigma) is generated using user defined
-    parameters, which are guesses for resistance R and capacitance C of the
-    RLC circuit. The inductance L was given in the instruction manual.
+    and Waves [2020], a plot of g(sigma) is generated using the parameters
+    for resistance R and capacitance C of the RLC circuit fitted to the data
+    (see sweep_fit.py). The inductance L was given in the instruction manual.
     '''
     freq = data[0]
     R, L, C = params.values()
-    plt.plot(freq,
-             [g(np.pi*2*sigma, R, L, C) for sigma in freq],
-             label='Lorentzian g(σ)',
-             color='green')
+    render.plot(freq,
+                g(np.pi*2*freq, R, L, C),
+                label='Lorentzian g(σ)',
+                color='green')
 
-# Import CSV and parse the data to a tuple of lists.
-dataframe = pandas.read_csv(FILE_PATH, delimiter=';')
-data = parse_data(dataframe, 4)
+# Import CSV and parse the data to a tuple of arrays.
+data = parse_data(FILE_PATH, 4)
 
 norm_scatter(data, size=1, alpha=0.5)
 
+# Fit R and C of g(sigma) to the normalized gain, starting from the resonance peak and its -3 dB bandwidth.
+freq, gain_dbm = data
+fit = fit_rlc(freq, normalize(dbm_to_linear(gain_dbm)), INDUCTANCE_VALUE)
+print(f"R = {fit.R:.2f} ± {fit.errors['R']:.2f} ohm, C = {fit.C*10**12:.4f} ± {fit.errors['C']*10**12:.4f} pF")
+print(f"f_0 = {fit.resonance_frequency/10**6:.2f} MHz, Q = {fit.q_factor:.2f}")
+
 # Parameters for g(sigma), where R is in ohm, L in Henry, and C in Farad.
-params = {'R': 40, 'L': INDUCTANCE_VALUE, 'C': (2.27*10**-12)}
+params = {'R': fit.R, 'L': INDUCTANCE_VALUE, 'C': fit.C}
 lorentz_fit(data, params)
 
 # Plot settings & Show plot
 plt.xlabel('Frequency [Hz]')
 plt.ylabel('Normalized Gain')
 plt.legend()
-plt.show()
+render.show('rlc_fit')
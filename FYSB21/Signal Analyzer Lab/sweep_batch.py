@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+# Copyright © 2021 Pim Nelissen.
+# This software is licensed under the MIT license.
+# Read more at https://mit-license.org/.
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import glob
+import os
+import sys
+import time
+import numpy as np
+from sweep_cache import load_sweep
+from sweep_fit import fit_rlc
+from sweep_kernels import dbm_to_linear, normalize
+
+'''
+Batch processing of analyzer sweeps.
+
+Every sweep CSV matched by the given paths, directories or glob patterns is parsed
+(through the cache, see sweep_cache.py), normalized and fitted with the RLC response
+(see sweep_fit.py) on a pool of processes, one sweep per task, without plotting anything.
+The results are written as a CSV table with one row per sweep, e.g.
+
+    PYTHONPATH=../.. python3 sweep_batch.py data -o summary.csv
+
+Sweeps that cannot be read or fitted get a row with the error instead of the fit, and so
+do sweeps whose fitted resonance lies outside the swept frequencies.
+'''
+
+SKIP_POINTS = 4 # The first points of a sweep are left out, like in rlc_plot.py.
+INDUCTANCE_VALUE = 100*10**-9 # Value for L given by instruction manual.
+COLUMNS = ['file', 'resonance_frequency', 'q_factor', 'R', 'R_error', 'C', 'C_error',
+           'peak_frequency', 'peak_gain', 'cost', 'error']
+
+def find_sweeps(patterns):
+    '''
+    Returns the sorted CSV files matched by `patterns`, which can be files, directories
+    (all CSV files in them) or glob patterns (with ** matching any number of directories).
+    '''
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, '*.csv')
+        paths.update(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+    return sorted(paths)
+
+def process_sweep(path, inductance=INDUCTANCE_VALUE, skip=SKIP_POINTS):
+    '''
+    Parses, normalizes and fits the sweep at `path`. Returns a dict with the COLUMNS.
+    '''
+    row = dict.fromkeys(COLUMNS, '')
+    row['file'] = path
+    try:
+        header, freq, gain_dbm = load_sweep(path)
+        freq, gain_dbm = freq[skip:], gain_dbm[skip:]
+        peak = np.argmax(gain_dbm)
+        row['peak_frequency'] = freq[peak]
+        row['peak_gain'] = gain_dbm[peak]
+
+        fit = fit_rlc(freq, normalize(dbm_to_linear(gain_dbm)), inductance)
+        row.update(resonance_frequency=fit.resonance_frequency, q_factor=fit.q_factor,
+                   R=fit.R, R_error=fit.errors['R'], C=fit.C, C_error=fit.errors['C'], cost=fit.cost)
+        # Sweeps that are not of an RLC circuit give a fit that runs off, away from the data.
+        if not freq[0] <= fit.resonance_frequency <= freq[-1]:
+            row['error'] = 'Fitted resonance lies outside the sweep.'
+    except Exception as error: # One bad file should not stop the whole batch.
+        row['error'] = f'{type(error).__name__}: {error}'
+    return {key: (float(value) if isinstance(value, np.floating) else value) for key, value in row.items()}
+
+def process_batch(paths, workers=None, inductance=INDUCTANCE_VALUE, skip=SKIP_POINTS):
+    '''
+    Processes the sweeps at `paths` on `workers` processes (all cores if None).
+    Returns the rows in the same order as `paths`.
+    '''
+    if workers == 1:
+        return [process_sweep(path, inductance, skip) for path in paths]
+    # Sweeps are handed out in chunks, so that thousands of small files do not cost a round trip each.
+    workers = workers or os.cpu_count()
+    chunksize = max(1, len(paths) // (4*workers))
+    with ProcessPoolExecutor(workers) as executor:
+        return list(executor.map(process_sweep, paths, [inductance]*len(paths), [skip]*len(paths),
+                                 chunksize=chunksize))
+
+def write_summary(rows, file):
+    writer = csv.DictWriter(file, COLUMNS)
+    writer.writeheader()
+    writer.writerows(rows)
+
+def main():
+    parser = argparse.ArgumentParser(description='Fits the RLC response to many analyzer sweeps at once.')
+    parser.add_argument('paths', nargs='+', help='sweep CSV files, directories or glob patterns')
+    parser.add_argument('-o', '--output', help='summary CSV to write (default: standard output)')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='number of processes (default: all cores)')
+    parser.add_argument('-L', '--inductance', type=float, default=INDUCTANCE_VALUE, help='inductance L in henry')
+    parser.add_argument('--skip', type=int, default=SKIP_POINTS, help='number of points to leave out at the start')
+    args = parser.parse_args()
+
+    paths = find_sweeps(args.paths)
+    if not paths:
+        parser.error('no sweep files found')
+
+    start = time.perf_counter()
+    rows = process_batch(paths, args.workers, args.inductance, args.skip)
+    elapsed = time.perf_counter() - start
+
+    if args.output:
+        with open(args.output, 'w', newline='') as file:
+            write_summary(rows, file)
+    else:
+        write_summary(rows, sys.stdout)
+    failed = sum(1 for row in rows if row['error'])
+    print(f'Processed {len(rows)} sweeps ({failed} failed) in {elapsed:.2f} s.', file=sys.stderr)
+
+if __name__ == '__main__':
+    main()
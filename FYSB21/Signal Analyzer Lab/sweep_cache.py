@@ -0,0 +1,199 @@
+#!/usr/bin/python3
+# Copyright © 2021 Pim Nelissen.
+# This software is licensed under the MIT license.
+# Read more at https://mit-license.org/.
+
+from dataclasses import asdict
+import hashlib
+import json
+import os
+import numpy as np
+from lu_work import instrument
+from sweep_reader import SweepHeader, read_sweep
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.sweep_cache')
+MAX_CACHE_BYTES = 2**30 # Total size of the cache, beyond which the least recently used sweeps are removed.
+INDEX_EXTENSION = '.index' # The extension of the index entries, see below.
+
+'''
+Binary cache for parsed analyzer sweeps.
+
+A parsed sweep is stored as one .npy file holding a (2, N) float64 array, with the
+frequencies in the first row and the gains in the second, next to a .json file with
+its header. The files are named after the SHA-256 hash of the CSV's content and its
+modification time, so an edited (or touched) CSV is parsed again. The .npy file is
+loaded memory-mapped, so loading a cached sweep copies nothing until it is used.
+
+To not hash every CSV on every load, an index entry remembers the hash of a path together
+with its size and modification time, and the hash is only computed again when either of
+those has changed. Every path has its own index entry file (named after the hash of the
+path), so processes that cache different sweeps at the same time, like the workers of
+sweep_batch.py, never write the same file and cannot undo each other's updates.
+
+If the cache cannot be written, e.g. because the directory is read-only or the disk is
+full, sweeps are still parsed and returned, they are just not cached.
+'''
+
+def file_hash(path, block_size=2**20):
+    '''
+    Returns the SHA-256 hash of the content of the file at `path`, read in blocks.
+    '''
+    sha = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(block_size), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+def _index_path(cache_dir, path):
+    return os.path.join(cache_dir, hashlib.sha256(path.encode()).hexdigest() + INDEX_EXTENSION)
+
+def _read_json(path):
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+def _write_atomic(path, write, mode='w'):
+    # Written to a temporary file first and then renamed, so readers never see a half written file.
+    temporary = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(temporary, mode) as file:
+            write(file)
+        os.replace(temporary, path)
+    except BaseException:
+        # E.g. the disk is full: the half written temporary file is not left behind.
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+        raise
+
+def _write_json(path, data):
+    _write_atomic(path, lambda file: json.dump(data, file))
+
+def cache_key(path, cache_dir=CACHE_DIR):
+    '''
+    Returns the key of the CSV at `path`, made from its content hash and modification time.
+    '''
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    index_path = _index_path(cache_dir, path)
+    entry = _read_json(index_path)
+    if entry is None or entry['size'] != stat.st_size or entry['mtime_ns'] != stat.st_mtime_ns:
+        old_entry, entry = entry, {'path': path, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': file_hash(path)}
+        try:
+            # The sweep that was cached for the old content of this path is not needed anymore.
+            if old_entry is not None:
+                _remove(cache_dir, _key(old_entry))
+            os.makedirs(cache_dir, exist_ok=True)
+            _write_json(index_path, entry)
+        except OSError:
+            pass # The cache cannot be written, so the hash is just computed again the next time.
+    return _key(entry)
+
+def _key(entry):
+    return f"{entry['hash']}-{entry['mtime_ns']}"
+
+def _remove(cache_dir, key):
+    for extension in ('.npy', '.json'):
+        try:
+            os.remove(os.path.join(cache_dir, key + extension))
+        except FileNotFoundError:
+            pass
+
+@instrument.timed('load_sweep')
+def load_sweep(path, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+    '''
+    Reads an FPC1500 sweep CSV like sweep_reader.read_sweep(), but from the cache if it has been
+    parsed before. Returns the header, and (read-only, memory-mapped) float64 arrays of the
+    frequencies (Hz) and magnitudes (dBm).
+    '''
+    key = cache_key(path, cache_dir)
+    data_path = os.path.join(cache_dir, key + '.npy')
+    header_path = os.path.join(cache_dir, key + '.json')
+
+    try:
+        with open(header_path) as file:
+            header = json.load(file)
+        data = np.load(data_path, mmap_mode='r')
+    except (OSError, ValueError):
+        instrument.count('load_sweep', 'misses')
+        header, freq, gain = read_sweep(path)
+        try:
+            store_sweep(key, header, freq, gain, cache_dir, max_bytes)
+        except OSError:
+            # The sweep cannot be cached (e.g. a read-only directory or a full disk), but it is parsed all the same.
+            instrument.count('load_sweep', 'store_errors')
+        return header, freq, gain
+
+    instrument.count('load_sweep', 'hits')
+    try:
+        # Mark the sweep as recently used, for the eviction below.
+        os.utime(data_path)
+    except OSError:
+        pass
+    header['fields'] = {name: tuple(entry) for name, entry in header['fields'].items()}
+    return SweepHeader(**header), data[0], data[1]
+
+def store_sweep(key, header, freq, gain, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+    '''
+    Stores a parsed sweep in the cache under `key`, and evicts the least recently used
+    sweeps if the cache has grown beyond `max_bytes`. Raises an OSError if the cache cannot be written.
+    '''
+    os.makedirs(cache_dir, exist_ok=True)
+    data = np.stack([freq, gain])
+    _write_atomic(os.path.join(cache_dir, key + '.npy'), lambda file: np.save(file, data), 'wb')
+    _write_json(os.path.join(cache_dir, key + '.json'), asdict(header))
+    evict(cache_dir, max_bytes, keep=key)
+
+def evict(cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, keep=None):
+    '''
+    Removes the least recently used sweeps, together with the index entries that point to them,
+    from the cache until it is at most `max_bytes` in size. Index entries of sweeps that are not
+    cached (anymore) are removed by the time they were last written. The sweep with key `keep`
+    (and its index entries) is never removed.
+    '''
+    # Every key gets the time it was last used, its size and its files, which are removed together.
+    groups = {}
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if name.endswith(INDEX_EXTENSION):
+            entry = _read_json(path)
+            key = name if entry is None else _key(entry) # A broken entry is removed on its own.
+        elif name.endswith(('.npy', '.json')):
+            key = os.path.splitext(name)[0]
+        else:
+            continue # E.g. the temporary file of a write in progress.
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue # Removed by another process in the meantime.
+        group = groups.setdefault(key, {'used': None, 'written': 0, 'size': 0, 'files': []})
+        if name.endswith('.npy'):
+            # Loading a sweep touches its .npy file, so that is when the sweep was last used.
+            group['used'] = stat.st_mtime
+        group['written'] = max(group['written'], stat.st_mtime)
+        group['size'] += stat.st_size
+        group['files'].append(path)
+
+    total = sum(group['size'] for group in groups.values())
+    used = lambda key: groups[key]['written'] if groups[key]['used'] is None else groups[key]['used']
+    for key in sorted(groups, key=used):
+        if total <= max_bytes:
+            break
+        if key != keep:
+            for path in groups[key]['files']:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            total -= groups[key]['size']
+
+def clear_cache(cache_dir=CACHE_DIR):
+    '''
+    Removes every cached sweep and index entry.
+    '''
+    if os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            os.remove(os.path.join(cache_dir, name))
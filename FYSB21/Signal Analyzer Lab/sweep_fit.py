@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+# Copyright © 2021 Pim Nelissen.
+# This software is licensed under the MIT license.
+# Read more at https://mit-license.org/.
+
+from dataclasses import dataclass, field
+import numpy as np
+from lu_work import instrument
+from sweep_kernels import rlc_response
+
+'''
+Nonlinear least-squares fit of the RLC response g(sigma) to a sweep.
+
+The model is A g(2 pi f; R, L, C), fitted to the normalized (linear) gain. R and C are
+fitted as log R and log C, since C is of the order 10^-12 and both must be positive, and
+the amplitude A is fitted as it is. With u = (1/(sigma C) - L sigma)/R = (1 - LC sigma^2)/(RC sigma),
+so that g = (1 + u^2)^(-1/2), the Jacobian follows from dg/du = -u g^3:
+    * dg/d(log R) = u^2 g^3
+    * dg/d(log C) = u g^3 / (sigma C R)
+    * dg/dA = g
+
+Since g only depends on LC and RC, L cannot be fitted together with R and C (any L fits
+equally well with the right R and C), so L is kept at the given value.
+'''
+
+@dataclass
+class RLCFit:
+    '''
+    Result of fit_rlc(). The values of R (ohm), L (henry), C (farad) and the amplitude,
+    with their standard errors in `errors`. Parameters that were not fitted have no error.
+    '''
+    R: float
+    L: float
+    C: float
+    amplitude: float
+    errors: dict = field(default_factory=dict)
+    cost: float = None # Sum of the squared residuals.
+    nfev: int = None # Number of evaluations of the model.
+
+    @property
+    def resonance_frequency(self):
+        return 1/(2*np.pi*np.sqrt(self.L*self.C))
+
+    @property
+    def q_factor(self):
+        return np.sqrt(self.L/self.C)/self.R
+
+def initial_guess(freq, gain, L):
+    '''
+    Guesses R and C from the resonance peak and its bandwidth. At the peak sigma_0 = 1/sqrt(LC),
+    so C = 1/(sigma_0^2 L), and g drops to 1/sqrt(2) of the peak (-3 dB) where |1/(sigma C) - L sigma| = R,
+    which is a band of width R/L around sigma_0, so R = L * bandwidth.
+    Returns R, C and the amplitude (the height of the peak).
+    '''
+    freq = np.asarray(freq)
+    gain = np.asarray(gain)
+    peak = np.argmax(gain)
+    sigma_0 = 2*np.pi*freq[peak]
+
+    # The -3 dB band is the run of points around the peak that are at least peak/sqrt(2).
+    above = gain >= gain[peak]/np.sqrt(2)
+    low = peak - np.argmin(above[peak::-1]) if not np.all(above[:peak+1]) else 0
+    high = peak + np.argmin(above[peak:]) if not np.all(above[peak:]) else len(gain) - 1
+    bandwidth = 2*np.pi*max(freq[high] - freq[low], freq[1] - freq[0])
+
+    return L*bandwidth, 1/(sigma_0**2*L), gain[peak]
+
+@instrument.timed('fit_rlc')
+def fit_rlc(freq, gain, L, fit_amplitude=False, R=None, C=None):
+    '''
+    Fits R and C (and the amplitude, if asked) of A g(2 pi f; R, L, C) to the normalized
+    gain, for the given inductance L. R and C start from initial_guess(),
+    unless they are given. Returns an RLCFit.
+    '''
+    import scipy.optimize # Only imported here, so that importing this module stays fast.
+    freq = np.asarray(freq, dtype=float)
+    gain = np.asarray(gain, dtype=float)
+    sigma = 2*np.pi*freq
+    R_0, C_0, A_0 = initial_guess(freq, gain, L)
+    R_0 = R_0 if R is None else R
+    C_0 = C_0 if C is None else C
+
+    # The parameter vector is [log R, log C], followed by A if it is fitted.
+    names = ['R', 'C'] + (['amplitude'] if fit_amplitude else [])
+    p_0 = [np.log(R_0), np.log(C_0)] + ([A_0] if fit_amplitude else [])
+
+    def unpack(p):
+        A = p[2] if fit_amplitude else 1.0
+        return np.exp(p[0]), np.exp(p[1]), A
+
+    # The residuals and Jacobian are returned as new arrays, since least_squares keeps
+    # the ones of the current step while it tries the next one.
+    def residual(p):
+        R, C, A = unpack(p)
+        return A*rlc_response(sigma, R, L, C) - gain
+
+    def jac(p):
+        R, C, A = unpack(p)
+        g = rlc_response(sigma, R, L, C)
+        u = (1/(sigma*C) - L*sigma)/R
+        common = A*u*g**3 # Shared by all derivatives below.
+        columns = [common*u, common/(sigma*C*R)]
+        if fit_amplitude:
+            columns.append(g)
+        return np.column_stack(columns)
+
+    result = scipy.optimize.least_squares(residual, p_0, jac=jac, method='lm')
+    instrument.count('fit_rlc', 'nfev', result.nfev)
+    instrument.count('fit_rlc', 'njev', result.njev)
+    R, C, A = unpack(result.x)
+
+    # Standard errors from the covariance s^2 (J^T J)^-1, with s^2 the residual variance.
+    # For the log parameters, the error of exp(p) is exp(p) times the error of p.
+    dof = max(len(gain) - len(p_0), 1)
+    try:
+        covariance = np.linalg.inv(result.jac.T.dot(result.jac)) * (2*result.cost/dof)
+        std = np.sqrt(np.diag(covariance))
+    except np.linalg.LinAlgError:
+        std = np.full(len(p_0), np.nan)
+    values = {'R': R, 'C': C, 'amplitude': A}
+    errors = {name: (std[i] if name == 'amplitude' else values[name]*std[i]) for i, name in enumerate(names)}
+
+    return RLCFit(R, L, C, A, errors, 2*result.cost, result.nfev)
@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+# Copyright © 2021 Pim Nelissen.
+# This software is licensed under the MIT license.
+# Read more at https://mit-license.org/.
+
+import numpy as np
+
+'''
+Array kernels for analyzer sweeps.
+
+Every kernel works on a whole array of points at once. If an `out` array is given,
+the result is written into it (it may be the input array itself) and no temporary
+arrays are allocated, so the kernels can be evaluated over and over inside fitting
+loops. Otherwise a new array is returned. (rlc_response needs its input after writing
+to `out`, so it copies the input if `out` is the input array itself.)
+'''
+
+DB_TO_LN = np.log(10)/10 # 10^(x/10) = exp(x * ln(10)/10)
+
+def dbm_to_linear(dbm, out=None):
+    '''
+    Converts gain from dBm (decibel milliwatts) to linear power, using the
+    formula Gain = 10^(sigma/10).
+    '''
+    dbm = np.asarray(dbm, dtype=float)
+    if out is None:
+        out = np.empty(dbm.shape)
+    np.multiply(dbm, DB_TO_LN, out=out)
+    return np.exp(out, out=out)
+
+def linear_to_dbm(gain, out=None):
+    '''
+    Converts linear power to dBm, using the formula sigma = 10 log10(Gain).
+    '''
+    gain = np.asarray(gain, dtype=float)
+    if out is None:
+        out = np.empty(gain.shape)
+    np.log10(gain, out=out)
+    return np.multiply(out, 10, out=out)
+
+def normalize(gain, out=None):
+    '''
+    Normalizes the gain, that is, Gain (Normalized) = Gain / max(Gain).
+    '''
+    return np.divide(gain, np.max(gain), out=out)
+
+def rlc_response(sigma, R, L, C, out=None):
+    '''
+    The response g(sigma) = 1/sqrt(1 + (1/R^2) (1/(sigma C) - L sigma)^2) of an RLC circuit
+    (formula 2.100 from Franklin's Mathematical Methods for Oscillations and Waves [2020]),
+    for the angular frequencies sigma. It is computed as 1/(sigma C) - L sigma = (1 - L C sigma^2)/(sigma C),
+    which only needs the one output array.
+    '''
+    sigma = np.asarray(sigma, dtype=float)
+    if out is None:
+        out = np.empty(sigma.shape)
+    elif np.shares_memory(out, sigma):
+        # sigma is still needed after sigma^2 has been written to out.
+        sigma = sigma.copy()
+    np.multiply(sigma, sigma, out=out)
+    out *= -L*C
+    out += 1
+    out /= sigma
+    out *= 1/(C*R)
+    np.square(out, out=out)
+    out += 1
+    np.sqrt(out, out=out)
+    return np.reciprocal(out, out=out)
@@ -0,0 +1,119 @@
+#!/usr/bin/python3
+# Copyright © 2021 Pim Nelissen.
+# This software is licensed under the MIT license.
+# Read more at https://mit-license.org/.
+
+from dataclasses import dataclass, field
+import numpy as np
+from lu_work import instrument
+
+DATA_HEADER = 'Frequency [Hz]' # First cell of the row that separates the metadata from the sweep data.
+CHUNK_SIZE = 2**16 # Number of sweep rows parsed at a time.
+
+# Metadata entries that are stored as attributes of SweepHeader, as (attribute, is numeric).
+HEADER_FIELDS = {
+    'Name': ('name', False),
+    'Date': ('date', False),
+    'Time': ('time', False),
+    'Instrument': ('instrument', False),
+    'Instrument Mode': ('instrument_mode', False),
+    'Center Frequency': ('center_frequency', True),
+    'Frequency Offset': ('frequency_offset', True),
+    'Span': ('span', True),
+    'Ref Level': ('ref_level', True),
+    'RBW': ('rbw', True),
+    'VBW': ('vbw', True),
+    'SWT': ('swt', True),
+}
+
+@dataclass
+class SweepHeader:
+    '''
+    Metadata block at the top of a Rohde & Schwarz FPC1500 sweep CSV. The numeric
+    settings are floats in the unit the analyzer writes next to them (Hz, dBm or s),
+    and every entry of the block is also kept as text in `fields`, as (value, unit).
+    '''
+    name: str = None
+    date: str = None
+    time: str = None
+    instrument: str = None
+    instrument_mode: str = None
+    center_frequency: float = None
+    frequency_offset: float = None
+    span: float = None
+    ref_level: float = None
+    rbw: float = None
+    vbw: float = None
+    swt: float = None
+    fields: dict = field(default_factory=dict)
+
+def to_float(text):
+    '''
+    Converts a number written with a decimal comma, like '0,038', to a float.
+    '''
+    return float(text.replace(',', '.'))
+
+@instrument.timed('read_header')
+def read_header(file):
+    '''
+    Reads the metadata block from an open sweep file, up to and including the
+    'Frequency [Hz]' row, so that the file is left at the first row of sweep data.
+    '''
+    header = SweepHeader()
+    for line in file:
+        cells = line.rstrip('\r\n').split(';')
+        key = cells[0].strip()
+        if key == DATA_HEADER:
+            return header
+        if not key:
+            continue
+
+        value = cells[1] if len(cells) > 1 else ''
+        unit = cells[2] if len(cells) > 2 else ''
+        header.fields[key] = (value, unit)
+        if key in HEADER_FIELDS:
+            attribute, numeric = HEADER_FIELDS[key]
+            if numeric:
+                try:
+                    value = to_float(value)
+                except ValueError:
+                    value = None # Entries like '- - -' have no value.
+            setattr(header, attribute, value)
+
+    raise ValueError(f"No '{DATA_HEADER}' row found, this is not an FPC1500 sweep file.")
+
+def iter_sweep(path, chunksize=CHUNK_SIZE):
+    '''
+    Parses the sweep data of an FPC1500 CSV in chunks of `chunksize` rows, so that files
+    of any size are read in bounded memory. The decimal commas are handled by the pandas
+    C parser directly (decimal=','), without converting strings in Python.
+    Yields the header first, and then a (frequency, gain) tuple of float64 arrays per chunk.
+    '''
+    import pandas # Only imported here, since loading a sweep from the cache does not need it.
+
+    # The files are UTF-8 with a byte order mark, which 'utf-8-sig' removes.
+    with open(path, encoding='utf-8-sig') as file:
+        yield read_header(file)
+        chunks = pandas.read_csv(file, sep=';', decimal=',', header=None, usecols=[0, 1],
+                                 dtype=np.float64, chunksize=chunksize)
+        for chunk in chunks:
+            values = chunk.to_numpy()
+            instrument.count('iter_sweep', 'chunks')
+            instrument.count('iter_sweep', 'rows', len(values))
+            yield values[:, 0].copy(), values[:, 1].copy()
+
+@instrument.timed('read_sweep')
+def read_sweep(path, chunksize=CHUNK_SIZE):
+    '''
+    Reads an FPC1500 sweep CSV. Returns the header, and float64 arrays of the frequencies (Hz)
+    and magnitudes (dBm).
+    '''
+    sweep = iter_sweep(path, chunksize)
+    header = next(sweep)
+    freq, gain = [], []
+    for freq_chunk, gain_chunk in sweep:
+        freq.append(freq_chunk)
+        gain.append(gain_chunk)
+    if not freq:
+        return header, np.empty(0), np.empty(0)
+    return header, np.concatenate(freq), np.concatenate(gain)
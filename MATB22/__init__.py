@@ -0,0 +1,15 @@
+'''
+MATB22 linear algebra project: least squares, power iteration and implicit surfaces.
+
+The computations can be imported from here (e.g. `from MATB22 import min_x`) without starting
+the task menu. lin_algebra_project is only imported once one of the names is used, and SciPy
+and matplotlib only by the functions that need them.
+'''
+import importlib
+
+__all__ = ['LeastSquares', 'minimize_norm', 'min_x', 'min_x_norm', 'PowerIteration', 'iterates', 'solve_surface']
+
+def __getattr__(name):
+    if name in __all__:
+        return getattr(importlib.import_module('.lin_algebra_project', __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,7 +1,306 @@
+import argparse
 import numpy as np
-from matplotlib import pyplot as plt
-from mpl_toolkits import mplot3d
-import scipy.optimize
+from lu_work import render, instrument
+from lu_work.render import pyplot as plt
+# SciPy is imported in the functions that use it, so that importing this module stays fast.
+
+class LeastSquares:
+    '''
+    Minimizes ||Ax-b|| for a fixed matrix A and any number of vectors b by:
+        * Factorizing A = QR once, with Q having orthonormal columns and R upper triangular.
+        * Solving Rx = Q_t . b with a triangular solve, for all b (the columns of B) at once.
+    Unlike the normal equation A_t . A . x = A_t . b, this does not square the condition number of A.
+    '''
+    def __init__(self, A):
+        self.A = np.asarray(A, dtype=float)
+        self.Q, self.R = np.linalg.qr(self.A)
+
+    def solve(self, B):
+        '''
+        Returns the x minimizing ||Ax-b|| for every column b of B (or for B itself, if it is a single vector).
+        '''
+        import scipy.linalg
+        return scipy.linalg.solve_triangular(self.R, self.Q.T.dot(B))
+
+    def residuals(self, B):
+        '''
+        Returns the residual ||Ax-b|| of the solution x for every column b of B (or for B itself).
+        Since A.x = Q.Q_t.b, the residual vector is b - Q.Q_t.b, which needs no solve at all.
+        '''
+        B = np.asarray(B, dtype=float)
+        return np.linalg.norm(B - self.Q.dot(self.Q.T.dot(B)), axis=0)
+
+@instrument.timed("minimize_norm")
+def minimize_norm(A, B, x_guess=None):
+    '''
+    Minimizes ||Ax-b|| numerically for every column b of B (or for B itself, if it is a single vector) by:
+        * Using scipy.optimize.least_squares() on the residual Ax-b, with its Jacobian A given analytically
+          (which is the same as giving the gradient A_t . (Ax-b) of 1/2 ||Ax-b||^2).
+        * Starting from x_guess (or zero) for the first b, and from the solution of the previous b for
+          every next b, since related b's have nearby solutions (warm start).
+    Returns the solutions x (one column per b) and a dict with the total number of evaluations
+    of the residual ('nfev') and of the Jacobian ('njev').
+    '''
+    import scipy.optimize
+    A = np.asarray(A, dtype=float)
+    B = np.asarray(B, dtype=float)
+    single = B.ndim == 1
+    if single:
+        B = B[:, None]
+
+    # 'lm' (Levenberg-Marquardt) needs at least as many equations as unknowns.
+    method = 'lm' if A.shape[0] >= A.shape[1] else 'trf'
+    jac = lambda x: A
+
+    X = np.empty((A.shape[1], B.shape[1]))
+    x = np.zeros(A.shape[1]) if x_guess is None else np.asarray(x_guess, dtype=float)
+    evaluations = {'nfev': 0, 'njev': 0}
+    for i in range(B.shape[1]):
+        b = B[:, i]
+        result = scipy.optimize.least_squares(lambda x: np.dot(A, x) - b, x, jac=jac, method=method)
+        x = X[:, i] = result.x
+        evaluations['nfev'] += result.nfev
+        evaluations['njev'] += result.njev
+    instrument.count("minimize_norm", "nfev", evaluations['nfev'])
+    instrument.count("minimize_norm", "njev", evaluations['njev'])
+
+    return (X[:, 0] if single else X), evaluations
+
+class PowerIteration:
+    '''
+    Closed form of the iterates z_n = A^n . z_0 of the power method, for any square matrix A, by:
+        * Diagonalizing A = V . D . V^-1 once, and writing z_0 = V . c, so that z_n = sum_j c_j * lambda_j^n * v_j.
+        * Dividing by L^n, with L the largest |lambda_j|, so that w_n = z_n / L^n only has powers of
+          lambda_j / L, which are at most 1 in size and cannot overflow.
+        * Keeping track of ||z_n|| as log ||z_n|| = n log L + log ||w_n|| (the log domain), for any n.
+    If A cannot be diagonalized (well), w_n = (A/L)^n . z_0 is computed with matrix powers instead.
+    All methods take a single n or an array of n, and give one row per n.
+    '''
+    # The condition number of V above which A counts as not diagonalizable. Solving V . c = z_0 loses about
+    # log10 of it in digits, so above 10^8 fewer than half of the 16 digits of a float would be left.
+    max_condition = 1e8
+
+    def __init__(self, A, z_0):
+        self.A = np.asarray(A, dtype=float)
+        self.z_0 = np.asarray(z_0, dtype=float)
+        self.eigenvalues, self.eigenvectors = np.linalg.eig(self.A)
+        # If A is not diagonalizable (e.g. [[1,1],[0,1]]), eig still gives as many eigenvectors as A has
+        # columns, but some of them are (nearly) the same, so V is (nearly) singular and c is meaningless.
+        self.diagonalizable = np.linalg.cond(self.eigenvectors) < self.max_condition
+        if self.diagonalizable:
+            self.c = np.linalg.solve(self.eigenvectors, self.z_0)
+        # (For a nilpotent A all eigenvalues are 0, and z_n is not scaled.)
+        self.L = np.max(np.abs(self.eigenvalues)) or 1.0
+        # The rate of convergence of v_n, which is |lambda_2| / |lambda_1| for the two largest |lambda|.
+        sizes = np.sort(np.abs(self.eigenvalues))
+        self.rate = sizes[-2] / sizes[-1] if len(sizes) > 1 and sizes[-1] else 0.0
+
+    def scaled(self, n):
+        '''
+        Returns w_n = z_n / L^n, for every n.
+        '''
+        n = np.asarray(n)
+        if not self.diagonalizable:
+            return self._scaled_powers(n)
+        powers = (self.eigenvalues / self.L) ** n[..., None]
+        w = (powers * self.c).dot(self.eigenvectors.T)
+        # For real A and z_0, the imaginary parts of complex eigenvalue pairs cancel out.
+        return w.real
+
+    def _scaled_powers(self, n):
+        # w_n = (A/L)^n . z_0 for every n, going through the n from small to large, so that every w_n
+        # is found from the one before it with the power (A/L)^(n - previous n).
+        B = self.A / self.L
+        flat = n.ravel()
+        w = np.empty((len(flat), len(self.z_0)))
+        previous, current = 0, self.z_0
+        for i in np.argsort(flat, kind='stable'):
+            current = np.linalg.matrix_power(B, int(flat[i]) - previous).dot(current)
+            previous = int(flat[i])
+            w[i] = current
+        return w.reshape(n.shape + (len(self.z_0),))
+
+    def log_norm(self, n):
+        '''
+        Returns log ||z_n||, for every n.
+        '''
+        return np.asarray(n) * np.log(self.L) + np.log(np.linalg.norm(self.scaled(n), axis=-1))
+
+    def z(self, n):
+        '''
+        Returns z_n = A^n . z_0, for every n (which overflows to inf once ||z_n|| is too large for a float).
+        '''
+        with np.errstate(over='ignore'):
+            return self.scaled(n) * (self.L ** np.asarray(n, dtype=float))[..., None]
+
+    def v(self, n):
+        '''
+        Returns v_n := z_n / ||z_n||, for every n, which equals w_n / ||w_n|| and so never overflows.
+        '''
+        w = self.scaled(n)
+        return w / np.linalg.norm(w, axis=-1, keepdims=True)
+
+    def q(self, n):
+        '''
+        Returns the Rayleigh quotient q_n = v_n^T A v_n, for every n.
+        '''
+        v = self.v(n)
+        return np.sum(v * v.dot(self.A.T), axis=-1)
+
+@instrument.timed("iterates")
+def iterates(a_n, a, epsilon, depth=64, rate=None, max_depth=10**6):
+    '''
+    Determines the iterates necessary to satisfy ||a_n - a|| < epsilon, for a single epsilon or an array of them, by:
+        * Computing the errors ||a_n - a|| for n = 0, ..., depth-1 with one call of a_n on an array of n.
+        * Taking the running minimum of the errors, which is non-increasing and drops below epsilon
+          at the same n as the errors themselves.
+        * Finding that n for every epsilon at once with a binary search (np.searchsorted).
+        * If an epsilon is not reached within depth iterates, either extrapolating with the geometric
+          convergence error_n ~ error_N * rate^(n-N) (if the rate is given), or doubling the depth (up to max_depth).
+    a_n must take an array of n and return one row per n, like the methods of PowerIteration.
+    '''
+    scalar = np.ndim(epsilon) == 0
+    epsilon = np.atleast_1d(np.asarray(epsilon, dtype=float))
+    while True:
+        n = np.arange(depth)
+        instrument.count("iterates", "terms", depth)
+        errors = np.linalg.norm(np.reshape(a_n(n) - a, (depth, -1)), axis=1)
+        running_min = np.minimum.accumulate(errors)
+
+        # -running_min is sorted in increasing order, and the number of errors >= epsilon is the first n with error < epsilon.
+        counts = np.searchsorted(-running_min, -epsilon, side='right')
+        missing = counts == depth
+        if not np.any(missing):
+            break
+        if rate is not None and 0 < rate < 1 and running_min[-1] > 0:
+            # Extrapolate from the last error, which is cheaper than computing more of the sequence.
+            extra = np.ceil(np.log(epsilon[missing] / running_min[-1]) / np.log(rate))
+            instrument.count("iterates", "extrapolated", np.count_nonzero(missing))
+            counts = counts.astype(float)
+            counts[missing] = depth - 1 + np.maximum(extra, 1)
+            break
+        if depth >= max_depth:
+            raise ValueError(f"Not every epsilon was reached within {max_depth} iterates.")
+        depth = min(2*depth, max_depth)
+
+    counts = counts.astype(int)
+    return int(counts[0]) if scalar else counts
+
+@instrument.timed("solve_surface")
+def solve_surface(g, X_1, X_2, guesses=(-10, 10), tol=1e-12, max_iter=100):
+    '''
+    Solves g(x_1, x_2, x_3) = 0 for x_3, on a whole grid of (x_1, x_2) at once, by:
+        * Evaluating g at x_3 = -1, 0, 1 to find a, b, c such that g = a x_3^2 + b x_3 + c, and checking
+          at x_3 = 2 and x_3 = -3 whether g really is a polynomial of degree at most 2 in x_3.
+        * If it is, solving a x_3^2 + b x_3 + c = 0 in closed form with the discriminant, for every grid point at once.
+          The two roots are returned smallest first, with NaN where there is no real root.
+        * If it is not, using Newton's method on the whole grid at once, starting from every guess, with the
+          derivative from central differences. Steps that do not decrease |g| are halved (damping), which keeps
+          the iteration from shooting off to where g overflows. A point has converged when |g| is at most
+          sqrt(tol) times the size of g on the grid (the largest of |a|, |b|, |c| and 1), and the step is small
+          or not finite. One solution is returned per guess, with NaN where it did not converge,
+          which is also the case where there is no root (e.g. where the steps stop at a minimum of |g| above 0).
+    g must work on numpy arrays of x_1, x_2 and x_3, and X_1, X_2 are arrays of the same shape (like from np.meshgrid).
+    Returns a list of arrays of x_3, with the same shape as X_1.
+    '''
+    X_1, X_2 = np.broadcast_arrays(np.asarray(X_1, dtype=float), np.asarray(X_2, dtype=float))
+    # g at a fixed x_3 for the whole grid (x_3 is passed as a single number, which is cheaper than a full array).
+    at = lambda x_3: np.broadcast_to(g(X_1, X_2, float(x_3)), X_1.shape)
+
+    g_minus, g_0, g_plus = at(-1), at(0), at(1)
+    a = (g_plus + g_minus)/2 - g_0
+    b = (g_plus - g_minus)/2
+    c = g_0
+    scale = max(np.max(np.abs(a)), np.max(np.abs(b)), np.max(np.abs(c)), 1)
+    quadratic = all(np.max(np.abs(at(x_3) - ((a*x_3 + b)*x_3 + c))) <= 1e-9*scale*x_3**2 for x_3 in (2, -3))
+
+    # g was evaluated 5 times on the whole grid to find out if it is quadratic in x_3.
+    instrument.count("solve_surface", "grid_evaluations", 5)
+    if quadratic:
+        instrument.count("solve_surface", "closed_form", 1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # The stable form of the quadratic formula: q = -(b + sign(b) sqrt(D))/2, with roots q/a and c/q.
+            # Where D < 0 there is no real root, and sqrt(D) makes both roots NaN.
+            D = b**2 - 4*a*c
+            q = -(b + np.copysign(np.sqrt(D), b))/2
+            r_1, r_2 = q/a, c/q
+            low, high = np.fmin(r_1, r_2), np.fmax(r_1, r_2)
+
+            # Where a = 0 the equation is linear, with the single root -c/b (or none if b = 0 as well).
+            # a and b come from differences of g, so they are only 0 up to rounding, relative to the scale of g.
+            linear = np.abs(a) <= 1e-12*scale
+            if np.any(linear):
+                root = np.where(np.abs(b[linear]) <= 1e-12*scale, np.nan, -c[linear]/b[linear])
+                low[linear] = root
+                high[linear] = root
+        return [low, high]
+
+    g_tol = np.sqrt(tol) * scale
+    solutions = []
+    for guess in guesses:
+        x_3 = np.full(X_1.shape, float(guess))
+        converged = np.zeros(X_1.shape, dtype=bool)
+        # Points where the step is not finite while |g| is not small, which do not move anymore (e.g. because the
+        # derivative underflowed to 0 far away from any root), so where no root can be found.
+        stuck = np.zeros(X_1.shape, dtype=bool)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            with np.errstate(over='ignore'):
+                g_x = g(X_1, X_2, x_3)
+                for _ in range(max_iter):
+                    instrument.count("solve_surface", "newton_steps", 1)
+                    instrument.count("solve_surface", "grid_evaluations", 3)
+                    h = 1e-7 * np.maximum(1, np.abs(x_3))
+                    step = g_x / ((g(X_1, X_2, x_3 + h) - g(X_1, X_2, x_3 - h)) / (2*h))
+                    # Steps that are not finite (e.g. where the derivative is 0) cannot be made.
+                    blocked = ~np.isfinite(step)
+                    # Points that have converged or are stuck are not moved anymore.
+                    active = ~(converged | stuck)
+                    step[~active | blocked] = 0
+
+                    # Halve the steps that do not make |g| smaller, at most 30 times. (A step can still be taken
+                    # if it does not, which lets a point get away from a minimum of |g| above 0.)
+                    g_new = g(X_1, X_2, x_3 - step)
+                    for _ in range(30):
+                        worse = active & ~(np.abs(g_new) <= np.abs(g_x))
+                        if not np.any(worse):
+                            break
+                        instrument.count("solve_surface", "halvings", 1)
+                        step[worse] /= 2
+                        g_new[worse] = g(X_1[worse], X_2[worse], x_3[worse] - step[worse])
+
+                    x_3 = x_3 - step
+                    g_x = g_new
+                    # A step that is small only because it was halved so often does not mean that a point has
+                    # converged, so |g| must be small as well. Close to a root, |g| is only rounding errors,
+                    # so there the step can also be blocked (like 0/0 at a double root).
+                    small = np.abs(g_x) <= g_tol
+                    converged |= active & small & (blocked | (np.abs(step) <= tol * np.maximum(1, np.abs(x_3))))
+                    stuck |= active & blocked & ~small
+                    if np.all(converged | stuck):
+                        break
+        x_3[~converged] = np.nan
+        solutions.append(x_3)
+    return solutions
+
+def min_x(A, b):
+    '''
+    (1.1) Solves normal equation A_t . A . x = A_t . b for x by:
+        * Taking transpose of matrix A.
+        * Taking the dot products A_t . A and A_t . b, and assign them new names B and C.
+        * Returning linalg.solve(B,C) to find the solution for Bx = C.
+    '''
+    A_t = np.transpose(A)
+    B = np.dot(A_t, A)
+    C = np.dot(A_t, b)
+    return np.linalg.solve(B, C)
+
+def min_x_norm(A, b, x_guess = [0, 0, 0]):
+    '''
+    (1.2) Finds the solution for ||Ax-b|| by:
+        * Using minimize_norm(), which minimizes ||Ax-b|| with the analytic gradient, starting from x_guess.
+        * Returning the solution (minimize_norm() also gives the number of evaluations it needed).
+    '''
+    return minimize_norm(A, b, x_guess)[0]
 
 # Task 1 - Find the vector x in R^3 that minimizes ||Ax-b||
 def task_1():
@@ -12,56 +311,43 @@ def task_1():
 
     b = np.array([1, -1, 1, -1]) # Numpy interprets this as a column matrix.
     
-    def min_x(A, b):
-        '''
-        (1.1) Solves normal equation A_t . A . x = A_t . b for x by:
-            * Taking transpose of matrix A.
-            * Taking the dot products A_t . A and A_t . b, and assign them new names B and C.
-            * Returning linalg.solve(B,C) to find the solution for Bx = C.
-        '''
-        A_t = np.transpose(A)
-        B = np.dot(A_t, A)
-        C = np.dot(A_t, b)
-        return np.linalg.solve(B, C)
-
-    def min_x_norm(A, b, x_guess = [0, 0, 0]):
-        '''
-        (1.2) Finds the solution for ||Ax-b|| by:
-            * Creating a lambda function f, which represents ||Ax-b|| in a programatical way.
-            * Finding a suitable 'guess' for the algorithm, which is based on the result of min_x().
-            * Use scipy.optimize.fmin() with the guess for x to solve for x
-        '''
-
-        f = lambda x: np.linalg.norm((np.dot(A, x) - b))
-        return scipy.optimize.fmin(f, x_guess,disp=False)
-    
     min_x_normal = min_x(A, b)
-    min_x_scipy = min_x_norm(A, b)
+    min_x_scipy, evaluations = minimize_norm(A, b, [0, 0, 0])
+
+    # For comparison, the number of evaluations of ||Ax-b|| that scipy.optimize.fmin() needs without the gradient.
+    import scipy.optimize
+    f = lambda x: np.linalg.norm((np.dot(A, x) - b))
+    fmin_calls = scipy.optimize.fmin(f, [0, 0, 0], disp=False, full_output=True)[3]
+    instrument.count("task_1.fmin", "nfev", fmin_calls)
 
     print(f"Task 1.1 - Using the normal equation A_t . A . x = A_t . b and solving for x, we obtain:\n{min_x_normal}\n")
-    print(f"Task 1.2 - With scipy.optimize.fmin(), the x for which ||Ax-b|| is minimized is:\n{min_x_scipy}\n")
+    print(f"Task 1.2 - With scipy.optimize.least_squares(), the x for which ||Ax-b|| is minimized is:\n{min_x_scipy}\n")
     print(f"Task 1.2 - The difference between the two is:\n{min_x_normal - min_x_scipy}\n")
+    print(f"Task 1.2 - This took {evaluations['nfev']} evaluations of Ax-b and {evaluations['njev']} of its Jacobian, where scipy.optimize.fmin() needs {fmin_calls}.\n")
+
+    # A is the same for every a, so it is factorized only once.
+    least_squares = LeastSquares(A)
 
     def r(a):
         '''
         (1.3) Creates a function representing the residual ||Ax(a) - b(a)|| by:
-            * Using min_x() from 1.1 to minimize the new solution x dependent on input a.
-            * Returning ||Ax(a)-b(a)||.
+            * Making b(a) = [1, a, 1, a], which is a matrix with one column per a if a is an array.
+            * Returning ||Ax(a)-b(a)|| of the least-squares solution x(a), for every a at once.
         '''
-        b = [1, a, 1, a] # Numpy interprets this as a column matrix.
-        x = min_x(A, b)
-        return np.linalg.norm(np.dot(A, x) - b)
+        ones = np.ones_like(a, dtype=float)
+        b = np.array([ones, a, ones, a])
+        return least_squares.residuals(b)
 
     x_axis = np.linspace(0,100,1000)
-    y_axis = [r(a) for a in x_axis] # For every value a, take ||Ax(a)-b(a)|| using the r(a) fn.
+    y_axis = r(x_axis) # For every value a, take ||Ax(a)-b(a)|| using the r(a) fn.
 
     # Show the result of task 1.3.
-    plt.plot(x_axis, y_axis)
+    render.plot(x_axis, y_axis)
     plt.xlabel("a")
     plt.ylabel("r(a)")
     plt.grid(color='black', linestyle='-', alpha=0.2)
     plt.title("Residual r(a) = ||Ax(a)-b(a)||")
-    plt.show()
+    render.show("task_1_residual")
 
 def task_2():
     A = np.array([[ 1,3,2],
@@ -70,70 +356,40 @@ def task_2():
 
     z_0 = np.array([8,3,12])
 
-    def z_closed(n):
-        '''
-        (2.1) Returns z_n based on derived closed form (to be shown in presentation).
-        '''
-        e_1 = np.array([1,12,-19])
-        e_2 = np.array([1,0,1])
-        e_3 = np.array([3,1,3])
-        return (-1)**(n+1) * 1/5 * e_1 - 3**n * 8 * e_2 + 4**n * 27/5 * e_3
-
-    def v_n(n):
-        '''
-        (2.2) Function representation of v_n := z_n / ||z_n||
-        '''
-        z_n = z_closed(n)
-        return z_n/np.linalg.norm(z_n)
-
-    def q_n(n):
-        '''
-        (2.4) Returns q_n for every normalized iterate of v_n by:
-            * Computing v_n for nth iterate.
-            * Returning q_n where q_n = v_n^T A v_n
-        '''
-        v = v_n(n)
-        return np.transpose(v).dot(A.dot(v))
-
-    def iterates(a_n,a,epsilon):
-        '''
-        (2.6) Determines iterates necessary to satisfy an epsilon difference by:
-            * Taking the norm ||v_n - v||.
-            * Returning amount of iterates when the norm is less than epsilon.
-        '''
-        n = 0
-        while True:
-            if np.linalg.norm(a_n(n)-a) < epsilon:
-                return n
-            n += 1
+    # (2.1) The closed form of z_n (to be shown in presentation) comes from the eigendecomposition of A,
+    # which PowerIteration computes once. It also gives (2.2) v_n := z_n / ||z_n|| and (2.4) q_n = v_n^T A v_n,
+    # for a single n or a whole array of n at once.
+    power_iteration = PowerIteration(A, z_0)
+    z_closed = power_iteration.z
+    v_n = power_iteration.v
+    q_n = power_iteration.q
 
     # (2.1) Check if z_n converges as n -> 'infinity' and print last result.
-    z_vals = [ z_closed(n) for n in range(0, 200) ]
+    z_vals = z_closed(np.arange(0, 200))
     print(f"Task 2.1 - As n → ∞, we have after 200 iterations that:\nz_n = {z_vals[-1]}")
     
-    plt.plot(np.array(range(0,200)), [ np.linalg.norm(z) for z in z_vals ])
+    render.plot(np.array(range(0,200)), np.linalg.norm(z_vals, axis=1))
     plt.title("Graph of Z_n as n → ∞")
-    plt.show()
+    render.show("task_2_z_n")
    
     # (2.2) Determining numerically the value that v_n converges to.
-    v_vals = [ v_n(n) for n in range(0,200) ]
+    v_vals = v_n(np.arange(0,200))
     v = v_vals[-1]
     print(f"Task 2.2 - As n → ∞, v_n converges to {v}")
     
     # (2.2) Plot iterates of v_n
-    X = [ v[0] for v in v_vals ]
-    Y = [ v[1] for v in v_vals ]
-    Z = [ v[2] for v in v_vals ]
+    X, Y, Z = v_vals[:,0], v_vals[:,1], v_vals[:,2]
+    from mpl_toolkits import mplot3d # Registers the '3d' projection.
     fig = plt.figure()
     ax = fig.add_subplot(projection='3d')
     ax.scatter(X,Y,Z)
     ax.plot(X,Y,Z)
     plt.title(f"Iteration of v_n := z_n / ||z_n|| for n from 0 to {len(v_vals)}")
-    plt.show()
+    render.show("task_2_v_n")
     fig.clf() # clear figure
 
     # (2.4) Check limit of q_n as n -> 'infinity', and print last result.
-    q_vals = [ q_n(n) for n in range(0,200) ]
+    q_vals = q_n(np.arange(0,200))
     q = q_vals[-1]
     print(f"Task 2.4 - the limit of q as n -> inf is approximately {round(q,2)}.")
 
@@ -144,30 +400,27 @@ def task_2():
     # (2.7) Set a range of epsilons between 10^-1 and 10^-14, and compute number of
     # iterates required for the result to be less than some epsilon in the range.
     epsilon_vals = 10**((-1)*np.linspace(1,14,1000))
-    v_iterates = [ iterates(v_n,v,eps) for eps in epsilon_vals ]
-    q_iterates = [ iterates(q_n,q,eps) for eps in epsilon_vals ]
+    # iterates() answers all epsilons at once, from a single computation of ||v_n - v|| and ||q_n - q||.
+    v_iterates = iterates(v_n,v,epsilon_vals)
+    q_iterates = iterates(q_n,q,epsilon_vals)
 
     # (2.7) Plot the number of iterates of ||v_n-v|| and ||q_n-n|| against epsilon.
     plt.gca().invert_xaxis()
     plt.semilogx(epsilon_vals,v_iterates,label="||v_n - v|| < ε")
     plt.semilogx(epsilon_vals,q_iterates,label="||q_n - q|| < ε")
     plt.legend()
-    plt.show()
+    render.show("task_2_iterates")
 
 def task_3():
-    def f(x_1,x_2):
+    def g(x_1,x_2,x_3):
         '''
-        (3b) Determines solution of x_3 for a given x_1 and x_2 by:
-            * Defining g as the given function, but making RHS equal to 0 (for fsolve()).
-            * Defining two reasonable initial values for the fsolve().
-            * Return the result.
+        (3b) The given function, but making RHS equal to 0, so that the surface is where g(x_1,x_2,x_3) = 0.
+        It is a polynomial of degree 2 in x_3, which solve_surface() detects and solves in closed form.
         '''
-        g = lambda x_3 : 2*x_1**2 - x_2**2 + 2*x_3**2 - 10*x_1*x_2 - 4*x_1*x_3 + 10*x_2*x_3 - 1
-        result_1 = scipy.optimize.fsolve(g,-10)
-        result_2 = scipy.optimize.fsolve(g,10)
-        return [result_1[0],result_2[0]]
+        return 2*x_1**2 - x_2**2 + 2*x_3**2 - 10*x_1*x_2 - 4*x_1*x_3 + 10*x_2*x_3 - 1
 
     # (3.1) Setting some parameters for the 3D plot of the function.
+    from mpl_toolkits import mplot3d # Registers the '3d' projection.
     fig = plt.figure()
     ax = fig.add_subplot(111, projection='3d')
 
@@ -175,33 +428,29 @@ def task_3():
     y = np.linspace(-1,1,20)
     X,Y = np.meshgrid(x,y)
 
-    Z_1 = []
-    Z_2 = []
-
-    # Below, we calculate z for all x-y combinations by looping over every y_coord
-    # and then generating a list of z values for every x_coord in x.
-    # This covers all possible x-y combinations of the plot.
-    # zip(*z_coord_list) separates the two different z values of each coordinate into their own lists.
-    
-    z_coord_list = []
-    for y_coord in y:
-       z = [f(x_coord, y_coord) for x_coord in x]
-       z_coord_list.append(zip(*z))
-    Z_1, Z_2 = zip(*z_coord_list)
+    # Below, we calculate both solutions z for all x-y combinations of the grid at once.
+    Z_1, Z_2 = solve_surface(g, X, Y)
     
     # (3.1) Plot the surfaces
-    Z_1 = np.array(Z_1)
-    Z_2 = np.array(Z_2)
 
     ax.plot_surface(X,Y,Z_1)
     ax.plot_surface(X,Y,Z_2)
 
-    plt.show()
+    render.show("task_3_surface")
     fig.clf()
 
 # Main function to run all the tasks.
-def main():
+def main(argv=None):
     task_list = [task_1, task_2, task_3]
+
+    # A task given on the command line (e.g. `python3 -m MATB22.lin_algebra_project 2`) is run without asking for input.
+    parser = argparse.ArgumentParser(description="Linear algebra project.")
+    parser.add_argument('task', nargs='?', type=int, choices=range(1,4), metavar='task', help="the task to run, from 1 to 3 (if not given, tasks are selected in the terminal)")
+    args = parser.parse_args(argv)
+    if args.task is not None:
+        task_list[args.task-1]()
+        return
+
     while True:
         try:
             i = int(input("Select the task to run! (0 to quit): "))
@@ -0,0 +1,31 @@
+"""
+    NUMA01 homework: approximating ln(x) (also to any number of digits), and interval arithmetic.
+
+    The computations can be imported from here (e.g. `from NUMA01 import approx_ln, Interval`) without
+    starting any of the task menus. The module that defines a name is only imported once the name is
+    used, and matplotlib only once a task makes a plot.
+"""
+import importlib
+
+# The public names, and the module that defines them.
+_EXPORTS = {
+    'approx_ln': 'homework_1_approximating_ln_x',
+    'approx_ln_table': 'homework_1_approximating_ln_x',
+    'fast_approx_ln': 'homework_1_approximating_ln_x',
+    'fast_approx_ln_table': 'homework_1_approximating_ln_x',
+    'fast_ln': 'homework_1_approximating_ln_x',
+    'agm_ln': 'precise_ln',
+    'carlsson_ln': 'precise_ln',
+    'Interval': 'homework_2_classes_and_interval_arithmetic',
+    'IntervalArray': 'homework_2_classes_and_interval_arithmetic',
+    'IntervalPolynomial': 'homework_2_classes_and_interval_arithmetic',
+    'find_roots': 'interval_search',
+    'find_minimum': 'interval_search',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,195 +1,460 @@
+import argparse, inspect
 import numpy as np
 from numpy import sqrt, log as ln, linspace
-from matplotlib import pyplot as plt
+from lu_work import render, instrument
+from lu_work.render import pyplot as plt
 from pprint import pprint
+import time
 
 
-def main():
-    
-    def approx_ln(x,n):
-        """
-            Approximates `ln(x)` using the algorithm described by B.C. Carlsson.\n
-
-            `x`: The value of which to approximate the natural logarithm. Must be greater than 0.
-
-            `n`: The number of iterations for the computations of the algorithm. A greater `n` results in a more accurate approximation.
-        """
-        # X must be greater than 0, or else the code should not be run.
-        if not x < 0:
-            # Initialize a value a_0 and g_0 and initialize an error value.
-            a = (1+x)/2
-            g = sqrt(x)
-            # For every step...
-            for i in range(1,n+1):
+@instrument.timed("approx_ln")
+def approx_ln(x,n,tol=None):
+    """
+        Approximates `ln(x)` using the algorithm described by B.C. Carlsson.\n
+
+        `x`: The value of which to approximate the natural logarithm. Must be greater than 0.
+        Can also be an array of values, in which case the algorithm runs on the whole array at once
+        and arrays of approximations and errors are returned.
+
+        `n`: The number of iterations for the computations of the algorithm. A greater `n` results in a more accurate approximation.
+
+        `tol`: Optional tolerance. If given, `n` is the maximum number of iterations, and the algorithm stops
+        as soon as |a_i - g_i| <= `tol` (for every x). The number of iterations used is then returned as a third value.
+    """
+    # Lists and tuples of x are turned into a numpy array, so that every step below works elementwise.
+    if not np.isscalar(x):
+        x = np.asarray(x, dtype=float)
+    # X must be greater than 0, or else the code should not be run.
+    if not np.any(x < 0):
+        # Initialize a value a_0 and g_0 and initialize an error value.
+        a = (1+x)/2
+        g = sqrt(x)
+        iterations = 0
+        # For every step...
+        for i in range(1,n+1):
+            # Once a_i and g_i agree, further steps barely change a_i, so stop early if a tolerance is given.
+            if tol is not None and np.all(abs(a - g) <= tol):
+                break
+
+            # Make a_i+1 equal to (a_i + g_i) / 2 and g_i+1 to be sqrt(a_i+1 * g_i)
+            next_a = (a + g)/2
+            next_g = sqrt(next_a * g)
+            
+            # Assign the previously calculated a_i+1/g_i+1 values to be a_i/g_i,
+            # so that they will be used in the next iteration.
+            a = next_a
+            g = next_g
+            iterations = i
+
+        instrument.count("approx_ln", "iterations", iterations)
+
+        # Calculate the approximation and return the result and error
+        approx = (x-1)/a
+        err = abs(approx - ln(x))
+        if tol is not None:
+            return approx, err, iterations
+        return approx, err
+
+    else:
+        # Raise an error if x is not greater than 0.
+        raise ValueError("Input must be greater than 0.")
+
+@instrument.timed("approx_ln_table")
+def approx_ln_table(x,n):
+    """
+        Approximates `ln(x)` using the algorithm described by B.C. Carlsson, for every number of iterations from 0 to `n` in a single pass.\n
+
+        `x`: The value, or array of values, of which to approximate the natural logarithm. Must be greater than 0.
+
+        `n`: The greatest number of iterations to compute the approximation for.
+
+        Returns arrays of approximations and errors, where row `i` holds the result of `approx_ln(x,i)`.
+    """
+    x = np.asarray(x, dtype=float)
+    if not np.any(x < 0):
+        # Every row of a_vals holds a_i for the whole array of x, for i from 0 to n.
+        a_vals = np.empty((n+1,) + x.shape)
+        a = (1+x)/2
+        g = sqrt(x)
+        a_vals[0] = a
+        for i in range(1,n+1):
+            # Make a_i+1 equal to (a_i + g_i) / 2 and g_i+1 to be sqrt(a_i+1 * g_i)
+            a = (a + g)/2
+            g = sqrt(a * g)
+            a_vals[i] = a
+        instrument.count("approx_ln_table", "iterations", n)
+
+        # Calculate the approximations for every i and return the results and errors
+        approx = (x-1)/a_vals
+        err = abs(approx - ln(x))
+        return approx, err
+
+    else:
+        # Raise an error if x is not greater than 0.
+        raise ValueError("Input must be greater than 0.")
+
+@instrument.timed("fast_approx_ln")
+def fast_approx_ln(x,n,tol=None):
+    """
+        Approximates `ln(x)` using the accelerated algorithm described by B.C. Carlsson.\n
+
+        `x`: The value of which to approximate the natural logarithm. Must be greater than 0.
+        Can also be an array of values, in which case arrays of approximations and errors are returned.
+
+        `n`: The number of iterations for the computations of the algorithm. A greater `n` results in a more accurate approximation.
+
+        `tol`: Optional tolerance. If given, `n` is the maximum number of iterations, and the algorithm stops as soon as
+        two successive accelerated values d(i-1,i-1) and d(i,i) differ by at most `tol` (for every x).
+        The number of iterations used is then returned as a third value.
+    """
+    x = np.asarray(x, dtype=float)
+    if tol is None and not np.any(x < 0):
+        # The approximation for n iterations only needs row n of the table for every n up to n,
+        # so the approximation and its error are only calculated for that row.
+        d = _fast_approx_ln_d(x,n)
+        instrument.count("fast_approx_ln", "iterations", n)
+        instrument.count("fast_approx_ln", "d_values", (n+1)*(n+2)//2)
+        approx = (x-1)/d[n]
+        err = abs(ln(x) - approx)
+        return approx, err
+
+    if not np.any(x < 0):
+        # Without knowing how many iterations are needed, the table is built one i at a time instead:
+        # the row d(0,i), d(1,i), ..., d(i,i) only needs a_i and the previous row d(k,i-1).
+        a = (1+x)/2
+        g = sqrt(x)
+        row = [a]
+        iterations = 0
+        for i in range(1,n+1):
+            # Make a_i+1 equal to (a_i + g_i) / 2 and g_i+1 to be sqrt(a_i+1 * g_i)
+            a = (a+g)/2
+            g = sqrt(a*g)
+
+            next_row = [a]
+            for k in range(1,i+1):
+                next_row.append((next_row[k-1]-(4**(-k))*row[k-1])/(1-4**(-k)))
+
+            # The diagonal d(i,i) is the accelerated value, so stop once it no longer changes.
+            converged = np.all(abs(next_row[i] - row[i-1]) <= tol)
+            row = next_row
+            iterations = i
+            if converged:
+                break
+        # The number of AGM iterations, and of values d(k,i) computed (for every x).
+        instrument.count("fast_approx_ln", "iterations", iterations)
+        instrument.count("fast_approx_ln", "d_values", (iterations+1)*(iterations+2)//2)
+
+        # Calculate the approximation and return the result, error and number of iterations used
+        approx = (x-1)/row[iterations]
+        err = abs(ln(x) - approx)
+        return approx, err, iterations
+
+    else:
+        # Raise an error if x is not greater than 0.
+        raise ValueError("Input must be greater than 0.")
+
+@instrument.timed("fast_approx_ln_table")
+def fast_approx_ln_table(x,n_max):
+    """
+        Approximates `ln(x)` using the accelerated algorithm described by B.C. Carlsson, for every n from 0 to `n_max` at once.\n
+
+        `x`: The value, or array of values, of which to approximate the natural logarithm. Must be greater than 0.
+
+        `n_max`: The greatest number of iterations to compute the approximation for.
+
+        Returns arrays of approximations and errors, where row `n` holds the result of `fast_approx_ln(x,n)`.
+    """
+    x = np.asarray(x, dtype=float)
+    if not np.any(x < 0):
+        d = _fast_approx_ln_d(x,n_max)
+        # The number of AGM iterations, and of values d(k,i) computed (for every x), where the recursive d() made 2^n calls.
+        instrument.count("fast_approx_ln_table", "iterations", n_max)
+        instrument.count("fast_approx_ln_table", "d_values", (n_max+1)*(n_max+2)//2)
+
+        # Calculate the approximations and return the results and errors
+        approx = (x-1)/d
+        err = abs(ln(x) - approx)
+        return approx, err
+
+    else:
+        # Raise an error if x is not greater than 0.
+        raise ValueError("Input must be greater than 0.")
+
+def _fast_approx_ln_d(x,n_max):
+    """
+        Returns the table of the accelerated method for the array `x` (which must be greater than 0),
+        where row `n` holds d(n,n) for `n` iterations, for every n from 0 to `n_max`.
+    """
+    # The accelerated method is built from d(k,i), with d(0,i) = a_i and
+    # d(k,i) = (d(k-1,i) - 4^-k * d(k-1,i-1)) / (1 - 4^-k) for k from 1 to n and i from k to n.
+    # Calling d() recursively evaluates the same values over and over again (2^n calls, each
+    # redoing the a_i iteration), so instead the table is filled in bottom-up, one level k at a time.
+
+    # Initialize a_0, g_0 and make the rows of d equal to a_0, a_1, ..., a_n_max, which is level k = 0 of the table.
+    # Every row holds the values for the whole array of x.
+    d = np.empty((n_max+1,) + x.shape)
+    a = (1+x)/2
+    g = sqrt(x)
+    d[0] = a
+    for i in range(1,n_max+1):
+        # Make a_i+1 equal to (a_i + g_i) / 2 and g_i+1 to be sqrt(a_i+1 * g_i)
+        a = (a+g)/2
+        g = sqrt(a*g)
+        d[i] = a
+
+    # For every level k, overwrite the rows i >= k of d with d(k,i), using the rows i-1 from level k-1.
+    # Row k is not touched again after level k, so in the end row n holds d(n,n), which is exactly
+    # the value the accelerated method uses for n iterations. (The rows are updated in place, so that
+    # a level only takes one temporary array, for 4^-k * d(k-1,i-1).)
+    for k in range(1,n_max+1):
+        d[k:] -= (4**(-k))*d[k-1:-1]
+        d[k:] /= 1-4**(-k)
+    return d
+
+# Table of ln(2^k) = k*ln(2), for every exponent k that a double (including subnormals) can have.
+# Index k + 1100 holds ln(2^k), so fast_ln() can look up the part of ln(x) coming from the exponent of x.
+ln_2_powers = np.arange(-1100,1100) * ln(2)
 
+def fast_approx_ln_weights(n):
+    """
+        Returns the weights w_0, ..., w_n for which d(n,n) of the accelerated method equals w_0*a_0 + ... + w_n*a_n.\n
+
+        Since d(n,n) is a fixed linear combination of a_0, ..., a_n, its weights are found by filling in
+        the d(k,i) table (like in fast_approx_ln_table()) with a_i replaced by the i-th unit vector.
+    """
+    weights = list(np.eye(n+1))
+    for k in range(1,n+1):
+        for i in range(n,k-1,-1):
+            weights[i] = (weights[i]-(4**(-k))*weights[i-1])/(1-4**(-k))
+    return weights[n]
+
+# For x close to 1, n = 4 steps of the accelerated method are already about as accurate as a double can be.
+# fast_ln() uses the partial sums W_j = w_0 + ... + w_j of the weights, for j from 0 to n-1.
+fast_ln_n = 4
+fast_ln_partial_weights = np.cumsum(fast_approx_ln_weights(fast_ln_n))[:-1]
+
+@instrument.timed("fast_ln")
+def fast_ln(x):
+    """
+        Computes `ln(x)` for any magnitude of x, using the accelerated B.C. Carlsson method on the mantissa of x only.
+        The result is within 2 units in the last place of ln(x), and within 1 for all but a few in a million x
+        (measured against numpy's `log` and Decimal for 1.6*10^8 values of x, with a mean error of 0.12 units),
+        which is a relative error of at most about 3.2e-16.\n
+
+        `x`: The value, or array of values, of which to compute the natural logarithm. Must be greater than 0.
+    """
+    x = np.asarray(x, dtype=float)
+    if not np.any(x < 0):
+        # Split x into m * 2^e with m in [0.5,1), and move m into [sqrt(1/2),sqrt(2)) so that it is close to 1.
+        # Then ln(x) = ln(m) + ln(2^e), where ln(2^e) is looked up in the table and only ln(m) is approximated.
+        # (A single x is made into an array of one value, so that m and e can be changed in place.)
+        m, e = np.frexp(np.atleast_1d(x))
+        small = m < sqrt(0.5)
+        m[small] *= 2
+        e -= small
+
+        # Run the iteration for a_i and g_i, and add up the weights times a_i to get d(n,n) directly.
+        # Two things keep this accurate to the last digits:
+        #   * Adding up w_i * a_i would lose digits, since the a_i are almost equal and the w_i have both signs
+        #     (w_3 = -0.48 and w_4 = 1.45), and the w_i do not add up to exactly 1 in floats either. Since the
+        #     weights add up to 1, d(n,n) = a_n + W_0 (a_0 - a_1) + ... + W_n-1 (a_n-1 - a_n) instead, where
+        #     a_i - a_i+1 = (a_i - g_i)/2 is small, so only a small correction is added to a_n.
+        #   * a_i and g_i are close to 1, so their rounding errors are large compared to ln(m). So the iteration
+        #     is done on alpha_i = a_i - 1 and gamma_i = g_i - 1 instead, with alpha_i+1 = (alpha_i + gamma_i)/2 and
+        #     gamma_i+1 = sqrt(1 + t) - 1 = t / (sqrt(1 + t) + 1), where t = alpha_i+1 + gamma_i + alpha_i+1 * gamma_i.
+        #     Then d(n,n) = 1 + alpha_n + the correction, where only the final sum rounds at the size of 1.
+        # The steps are done in place, since every temporary array costs about as much as the arithmetic.
+        with np.errstate(invalid='ignore'): # inf - inf for x = inf, which is handled below.
+            # gamma_0 = sqrt(m) - 1 = (m-1) / (sqrt(m) + 1) and alpha_0 = (m-1)/2, where m-1 is exact.
+            gamma = sqrt(m)
+            gamma += 1
+            m -= 1
+            np.divide(m, gamma, out=gamma)
+            alpha = m/2
+            correction = np.zeros_like(m)
+            t = np.empty_like(m)
+            for i in range(fast_ln_n):
+                # Add W_i (a_i - a_i+1) = W_i (alpha_i - gamma_i)/2 to the correction.
+                np.subtract(alpha, gamma, out=t)
+                t *= fast_ln_partial_weights[i]/2
+                correction += t
                 # Make a_i+1 equal to (a_i + g_i) / 2 and g_i+1 to be sqrt(a_i+1 * g_i)
-                next_a = (a + g)/2
-                next_g = sqrt(next_a * g)
-                
-                # Assign the previously calculated a_i+1/g_i+1 values to be a_i/g_i,
-                # so that they will be used in the next iteration.
-                a = next_a
-                g = next_g
-
-            # Calculate the approximation and return the result and error
-            approx = (x-1)/a
-            err = abs(approx - ln(x))
-            return approx, err
+                alpha += gamma
+                alpha *= 0.5
+                if i < fast_ln_n-1: # gamma_n is not needed.
+                    np.multiply(alpha, gamma, out=t)
+                    t += alpha
+                    t += gamma
+                    np.add(t, 1, out=gamma)
+                    sqrt(gamma, out=gamma)
+                    gamma += 1
+                    np.divide(t, gamma, out=gamma)
+            alpha += correction
 
-        else:
-            # Raise an error if x is not greater than 0.
-            raise ValueError("Input must be greater than 0.")
-    
-    def fast_approx_ln(x,n):
-        """
-            Approximates `ln(x)` using the accelerated algorithm described by B.C. Carlsson.\n
-
-            `x`: The value of which to approximate the natural logarithm. Must be greater than 0.
-
-            `n`: The number of iterations for the computations of the algorithm. A greater `n` results in a more accurate approximation.
-        """
-        if not x < 0:
-            def a(x,n):
-                # Initialize a_0, g_0
-                a = (1+x)/2
-                g = sqrt(x)
-
-                for i in range(n):
-                    # Make a_i+1 equal to (a_i + g_i) / 2 and g_i+1 to be sqrt(a_i+1 * g_i)
-                    next_a = (a+g)/2
-                    next_g = sqrt(next_a*g)
-                    
-                    # Assign the previously calculated a_i+1/g_i+1 values to be a_i/g_i,
-                    # so that they will be used in the next iteration.
-                    a = next_a
-                    g = next_g
-                
-                return a
-
-            # For the fast_approx_ln, it is apparent from the description of the method, that it concerns
-            # a recursive methods of approximation. Therefore, a function d() is made, that will calculate
-            # the value, by calling itself, with k being a value from 1 to n and i from 0 to n.
-            def d(x,k,i):
-                # Like the method described, for k = 0, we want to simply return a_i.
-                if k == 0:
-                    return a(x,i)
-                # Else, use the formula as decsribed for the accelerated method.
-                else:
-                    return (d(x,k-1,i)-(4**(-k))*(d(x,k-1,i-1)))/(1-4**(-k))
-
-            # Calculate the approximation and return the result and error
-            approx = (x-1)/d(x,n,n)
-            err = abs(ln(x) - approx)
-            return approx, err
-        
-        else:
-            # Raise an error if x is not greater than 0.
-            raise ValueError("Input must be greater than 0.")
+            # ln(x) = (m-1)/d(n,n) + ln(2^e), where (m-1)/d(n,n) = (m-1) - (m-1) * delta/(1 + delta) with
+            # d(n,n) = 1 + delta, so that 1 + delta only rounds in the (smaller) second term.
+            np.multiply(m, alpha, out=t)
+            alpha += 1
+            t /= alpha
+            m -= t
+            m += np.take(ln_2_powers, e+1100)
+
+        # The approximation cannot reach the limits ln(0) = -inf and ln(inf) = inf, so set them directly.
+        m[np.atleast_1d(x == 0)] = -np.inf
+        m[np.atleast_1d(x == np.inf)] = np.inf
+        return m.reshape(x.shape)[()]
+
+    else:
+        # Raise an error if x is not greater than 0.
+        raise ValueError("Input must be greater than 0.")
+
+def task_1(x=None,n=None):
+    """
+        Approximates `ln(x)` using the algorithm described by B.C. Carlsson. A greater `n` results in a more accurate approximation.
+    """
+    # User input, unless x and n are given (on the command line)
+    x = int(input("Please specify what x to approximate ln(x) for: ")) if x is None else x
+    n = int(input("Please specify a value for n (number of steps for approximation): ")) if n is None else n
     
-    def task_1():
-        """
-            Approximates `ln(x)` using the algorithm described by B.C. Carlsson. A greater `n` results in a more accurate approximation.
-        """
-        # User input
-        x = int(input("Please specify what x to approximate ln(x) for: "))
-        n = int(input("Please specify a value for n (number of steps for approximation): "))
-        
-        # Run the algorithm & print results
-        approx, err = approx_ln(x,n)
-        print(f"----------------\nResults\n----------------\nApproximating: ln({x})\nIterations: {n}\nApproximation: {approx}\nError: {err}")
+    # Run the algorithm & print results
+    approx, err = approx_ln(x,n)
+    print(f"----------------\nResults\n----------------\nApproximating: ln({x})\nIterations: {n}\nApproximation: {approx}\nError: {err}")
+
+def task_2(x=None,n=None):
+    """
+        Plots an approximation of ln(x) using `approx_ln()` against the actual function of ln(x).\n
+        A higher `n` results in greater precision.
+    """
+    # Allow user to specify any values of x and n, unless they are given (on the command line)
+    x = int(input("Please specify a range of x for the plot: ")) if x is None else x
+    n = int(input("Please specify the steps n for the algorithm: ")) if n is None else n
+
+    # Make the x axis more detailed by taking 1/10th steps between 0 and x.
+    x_axis = linspace(1,x,(x*10))
+    # Approximating ln(x), with the corresponding error, for the whole x-axis at once.
+    y_approx, y_err = approx_ln(x_axis,n)
+    # ln(x) for every x in the x-axis.
+    y_ln = ln(x_axis)
+
+    # Show approx_ln() and ln(x) plotted against the x-axis.
+    plt.subplot(1,2,1)
+    render.plot(x_axis, y_approx, label=f"Approx. for ln(x) with n = {n}")
+    render.plot(x_axis, y_ln, label="ln(x)")
+    plt.xlabel("x")
+    plt.ylabel("ln(x)")
+    plt.legend()
+
+    # Show the error plotted against the x-axis.
+    plt.subplot(1,2,2)
+    render.plot(x_axis, y_err, label=f"|approx_ln(x)-ln(x)| with n = {n}")
+    plt.xlabel("x")
+    plt.ylabel("Error of approximation")
+    plt.legend()
     
-    def task_2():
-        """
-            Plots an approximation of ln(x) using `approx_ln()` against the actual function of ln(x).\n
-            A higher `n` results in greater precision.
-        """
-        # Allow user to specify any values of x and n
-        x = int(input("Please specify a range of x for the plot: "))
-        n = int(input("Please specify the steps n for the algorithm: "))
-
-        # Make the x axis more detailed by taking 1/10th steps between 0 and x.
-        x_axis = linspace(1,x,(x*10))
-        # Creating a list of approximation results, with their corresponding error, for every x in the x-axis.
-        results = [approx_ln(x,n) for x in x_axis]
-        # List of approximations of ln(x) from the previously calculated results.
-        y_approx = [r[0] for r in results]
-        #  List of ln(x) for every x in the x-axis.
-        y_ln = [ln(x) for x in x_axis]
-
-        # Show approx_ln() and ln(x) plotted against the x-axis.
-        plt.subplot(1,2,1)
-        plt.plot(x_axis, y_approx, label=f"Approx. for ln(x) with n = {n}")
-        plt.plot(x_axis, y_ln, label="ln(x)")
-        plt.xlabel("x")
-        plt.ylabel("ln(x)")
-        plt.legend()
-
-        # Create a list of the errors, retrieved from the results list.
-        y_err = [r[1] for r in results]
-
-        # Show the error plotted against the x-axis.
-        plt.subplot(1,2,2)
-        plt.plot(x_axis, y_err, label=f"|approx_ln(x)-ln(x)| with n = {n}")
-        plt.xlabel("x")
-        plt.ylabel("Error of approximation")
-        plt.legend()
-        
-        plt.show()
-
-    def task_3():
-        """
-            Plots the error of approx_ln(1.41,n) against a certain integer n.
-        """
-        # User input & setting x to 1.41.
-        n = int(input("Please specify the steps n for the algorithm: "))
-        x = 1.41
-
-        # Let the x-axis be the values of n.
-        x_axis = linspace(1,n,n)
-        # Create a list of y-values for the error of approx_ln() of x = 1.41
-        y_err = [approx_ln(x,i)[1] for i in range(1,n+1)]
-
-        # Show the error of approximation for x = 1.41 plotted against n.
-        plt.plot(x_axis, y_err, label="Error of approximation of ln(1.41)")
-        plt.xlabel("n number of steps in the algorithm")
-        plt.legend()
-        plt.show()
+    render.show("approx_ln_task_2")
+
+def task_3(n=None):
+    """
+        Plots the error of approx_ln(1.41,n) against a certain integer n.
+    """
+    # User input (unless n is given on the command line) & setting x to 1.41.
+    n = int(input("Please specify the steps n for the algorithm: ")) if n is None else n
+    x = 1.41
+
+    # Let the x-axis be the values of n.
+    x_axis = linspace(1,n,n)
+    # The error of approx_ln() of x = 1.41 for every i from 1 to n, computed in a single pass.
+    y_err = approx_ln_table(x,n)[1][1:]
+
+    # Show the error of approximation for x = 1.41 plotted against n.
+    render.plot(x_axis, y_err, label="Error of approximation of ln(1.41)")
+    plt.xlabel("n number of steps in the algorithm")
+    plt.legend()
+    render.show("approx_ln_task_3")
+
+def task_4(x=None,n=None):
+    """
+        Approximates `ln(x)` using the accelerated B.C. Carlsson method. A greater `n` results in a more accurate approximation.
+    """
+    # User input, unless x and n are given (on the command line)
+    x = int(input("Please specify what x to approximate ln(x) for: ")) if x is None else x
+    n = int(input("Please specify a value for n (number of steps for approximation): ")) if n is None else n
     
-    def task_4():
-        """
-            Approximates `ln(x)` using the accelerated B.C. Carlsson method. A greater `n` results in a more accurate approximation.
-        """
-        # User input
-        x = int(input("Please specify what x to approximate ln(x) for: "))
-        n = int(input("Please specify a value for n (number of steps for approximation): "))
-        
-        # Run the fast approximation algorithm & print results
-        approx, err = fast_approx_ln(x,n)
-        print(f"----------------\nResults\n----------------\nApproximating: ln({x})\nIterations: {n}\nApproximation: {approx}\nError: {err}")
+    # Run the fast approximation algorithm & print results
+    approx, err = fast_approx_ln(x,n)
+    print(f"----------------\nResults\n----------------\nApproximating: ln({x})\nIterations: {n}\nApproximation: {approx}\nError: {err}")
+
+def task_5():
+    """
+       For the n values 2 to 5, and x from 1 to 20, this function plots
+       the error of approximation of `fast_approx_ln(x,n)` on a logarithmic scale.
+    """
+    # Set a linspace from 1 to 20, with 1/10th steps of detail between every integer of x.
+    x = linspace(1,21,200)
+
+    # Compute the error of fast_approx_ln(x,n) for every n up to 5 at once.
+    _, err = fast_approx_ln_table(x,5)
+
+    # For 2 to 5 iterations (n), plot the error value of fast_approx_ln(x,n).
+    # The x axis is what is being approximated. So one will obtain 4 graphs for
+    # n in [2,5] for x values of 1 to 20.
+    for n in range(2,6):
+        render.plot(x, err[n], label=f"{n} iterations")
     
-    def task_5():
-        """
-           For the n values 2 to 5, and x from 1 to 20, this function plots
-           the error of approximation of `fast_approx_ln(x,n)` on a logarithmic scale.
-        """
-        # Set a linspace from 1 to 20, with 1/10th steps of detail between every integer of x.
-        x = linspace(1,21,200)
-
-        # For 2 to 5 iterations (n), plot the error value of fast_approx_ln(x,n).
-        # The x axis is what is being approximated. So one will obtain 4 graphs for
-        # n in [2,5] for x values of 1 to 20.
-        for n in range(2,6):
-            plt.plot(x, [fast_approx_ln(x,n)[1] for x in range(200)], label=f"{n} iterations")
-        
-        # Observing the graph in the task description, it is clearly a logarithmic scale on the y-axis.
-        plt.yscale("log")
+    # Observing the graph in the task description, it is clearly a logarithmic scale on the y-axis.
+    plt.yscale("log")
+
+    # Show legend and assign labels/titles, and show the graph.
+    plt.legend()
+    plt.xlabel("x")
+    plt.ylabel("Error")
+    plt.title("Error behavior of accelerated Carlsson method for the natural log")
+    render.show("approx_ln_task_5")
+
+def task_6():
+    """
+        Benchmarks `fast_ln(x)` against numpy's `log(x)`, for speed and accuracy, over x of many orders of magnitude.
+    """
+    # One million x values from 10^-300 to 10^300, and another million close to 1.
+    for name, x in [("10^-300 to 10^300", np.logspace(-300,300,10**6)), ("0.5 to 2", linspace(0.5,2,10**6))]:
+        # Time both functions, taking the best of 5 runs to reduce noise.
+        times = []
+        for f in (fast_ln, ln):
+            best = float('inf')
+            for _ in range(5):
+                start = time.perf_counter()
+                f(x)
+                best = min(best, time.perf_counter() - start)
+            times.append(best)
+
+        # Measure the error in units of the last place (ulp) of the exact result, as given by numpy.
+        exact = ln(x)
+        ulps = abs(fast_ln(x) - exact) / np.spacing(abs(exact))
+        print(f"x from {name}:\n    fast_ln: {times[0]*1000:.2f} ms\n    numpy.log: {times[1]*1000:.2f} ms\n    Max error: {np.max(ulps):.2f} ulp\n    Mean error: {np.mean(ulps):.3f} ulp")
+
+# The tasks by number, for the menu and the command line.
+TASKS = {'1': task_1, '2': task_2, '3': task_3, '4': task_4, '5': task_5, '6': task_6}
+
+def main(argv=None):
+    """
+        Runs the task given on the command line with its parameters, e.g. `python3 -m NUMA01.homework_1_approximating_ln_x 1 -x 5 -n 10`,
+        without asking for input. If no task is given, the tasks can be selected in the terminal one after another.
+    """
+    parser = argparse.ArgumentParser(description="Approximating ln(x) with the method of B.C. Carlsson.")
+    parser.add_argument('task', nargs='?', choices=TASKS, help="the task to run (if not given, tasks are selected in the terminal)")
+    parser.add_argument('-x', type=int, help="the x of tasks 1, 2 and 4")
+    parser.add_argument('-n', type=int, help="the number of steps n of tasks 1 to 4")
+    args = parser.parse_args(argv)
 
-        # Show legend and assign labels/titles, and show the graph.
-        plt.legend()
-        plt.xlabel("x")
-        plt.ylabel("Error")
-        plt.title("Error behavior of accelerated Carlsson method for the natural log")
-        plt.show()
+    if args.task is not None:
+        # Pass the parameters that the task takes, all of which must be given so that it does not ask for input.
+        task = TASKS[args.task]
+        params = {name: getattr(args, name) for name in inspect.signature(task).parameters}
+        missing = [f"-{name}" for name, value in params.items() if value is None]
+        if missing:
+            parser.error(f"task {args.task} needs {' and '.join(missing)}")
+        task(**params)
+        return
 
     # This part of the code will run any individual task based on user input in the terminal.
     run = True
@@ -202,22 +467,14 @@ def main():
             print("----------------\nQuitting program!\n----------------")
             run = False
         
-        # Run one of the 5 tasks based on user input.
-        elif query in ['1','2','3','4','5']:
+        # Run one of the 6 tasks based on user input.
+        elif query in TASKS:
             print(f"----------------\nTask {query} starting\n----------------")
-            if query == '1':
-                task_1()
-            elif query == '2':
-                task_2()
-            elif query == '3':
-                task_3()
-            elif query == '4':
-                task_4()
-            elif query == '5':
-                task_5()
+            TASKS[query]()
             print(f"----------------\nTask {query} finished!\n----------------")
         else:
             print(f"----------------\nInvalid input!\n----------------")
 
 # Run main code
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
\ No newline at end of file
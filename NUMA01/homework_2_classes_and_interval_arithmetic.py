@@ -1,33 +1,78 @@
-import inspect, numpy as np
-from matplotlib import pyplot as plt
+import argparse, math, time, tracemalloc, numpy as np
+from fractions import Fraction
+from lu_work import render
+from lu_work.render import pyplot as plt
+
+INF = float('inf')
 
 # Task 6
 def inf_check(interval):
-    for value in vars(interval).values(): # Check all the attributes of the interval object.
-        if value == float('inf'):
-            return True # If a value is equal to infinity, the check returns True.
-        else:
-            pass
-    return False # If no infinity is found, the check fails and returns False.
+    # Check both endpoints of the interval. If either is equal to infinity, the check returns True.
+    return interval.left == INF or interval.right == INF
+
+REAL = (float,int) # The types that are treated as real numbers in the arithmetic below.
+
+# Rounding policies for the endpoints of the results of arithmetic operations.
+"""
+    With 'nearest', the endpoints are computed with plain float arithmetic, which rounds to the nearest float,
+    so the result may miss the true result by a tiny bit. With 'outward', the left endpoint is moved one float
+    down and the right endpoint one float up (with nextafter), so the result is guaranteed to contain the true
+    result of the operation, as every float operation is off by less than one float.
+"""
+ROUNDING = ('nearest','outward')
 
 # Task 1 - Construct the class
 class Interval:
+
+    # Only the two endpoints are stored, so instances do not need a __dict__.
+    # This makes them smaller and faster to create, which matters when many intervals are computed.
+    __slots__ = ('left','right')
+
+    # The rounding policy for the results of arithmetic, which is 'nearest' or 'outward' (see ROUNDING).
+    rounding = 'nearest'
+
+    @classmethod
+    def set_rounding(cls, rounding):
+        if rounding not in ROUNDING:
+            raise ValueError(f"The rounding must be one of {ROUNDING}.")
+        cls.rounding = rounding
     
     def __init__(self,left,right=None): # 1: left & right value for object
         
-        if right == None: # Right value defaults to None, if it's the case..
+        if right is None: # Right value defaults to None, if it's the case..
             right = left # Then only left value was entered. Make right = left, degenerative interval
 
         try:
-            check = lambda x: float(x) if not (type(x) == int) else x
-            left = check(left)
-            right = check(right)
-        except: # If float is not possible, and the type is not int, then it's not a real number.
+            # Integers are kept as they are, any other real number is made into a float.
+            if type(left) is not int:
+                left = float(left)
+            if type(right) is not int:
+                right = float(right)
+        except (TypeError, ValueError): # If float is not possible, and the type is not int, then it's not a real number.
             raise ValueError("The values for either the left or right endpoints was not a real number.")
         
         self.left = left # Assign input to the corresponding attributes of the object instance.
         self.right = right # Assign input to the corresponding attributes of the object instance.
 
+    @classmethod
+    def _make(cls, left, right):
+        """
+            Creates the result of an arithmetic operation, with endpoints that are already known to be real numbers.
+            This skips the checks and conversions of __init__, and raises the error of Task 6 if either end is infinity.
+            With outward rounding, the endpoints are moved outward here (integers are exact, so they are kept as they are).
+        """
+        if cls.rounding == 'outward':
+            if type(left) is not int:
+                left = math.nextafter(left, -INF)
+            if type(right) is not int:
+                right = math.nextafter(right, INF)
+        res = object.__new__(cls)
+        res.left = left
+        res.right = right
+        if inf_check(res):
+            raise ValueError("Either end of the interval is infinity.")
+        return res
+
     # Task 2 - Provide methods for the 4 basic arithmetic operations
     """
         For these methods, I used variable 'b' to signify the second object/integer
@@ -35,55 +80,43 @@ class Interval:
     """
     def __add__(self, b):
         # Task 8 - Adjust the code to allow operations with real numbers
-        if not inspect.isclass(b) and type(b) in (float,int): # If b is not a class and it's a real number,
-            b = Interval(b,b) # Create a degenerative interval for b.
+        if type(b) in REAL: # If b is a real number,
+            return Interval._make(self.left+b, self.right+b) # Then it is a degenerative interval [b,b].
+        if isinstance(b, IntervalArray): # Let IntervalArray handle operations with a whole array of intervals.
+            return NotImplemented
 
-        res = Interval((self.left+b.left),(self.right+b.right)) # [a,b]+[c,d] = [a+c,b+d]
-        
-        if not inf_check(res): 
-            return res # If the infinity check fails, return the result.
-        else:
-            raise ValueError("Either end of the interval is infinity.") # Otherwise raise error.
+        return Interval._make(self.left+b.left, self.right+b.right) # [a,b]+[c,d] = [a+c,b+d]
 
     def __sub__(self, b):
-        if not inspect.isclass(b) and type(b) in (float,int):
-            b = Interval(b,b)
-        
-        res = Interval((self.left-b.right),(self.right-b.left)) # [a,b]-[c,d] = [a-d,b-c]
-        
-        if not inf_check(res):
-            return res
-        else:
-            raise ValueError("Either end of the interval is infinity.")
+        if type(b) in REAL:
+            return Interval._make(self.left-b, self.right-b)
+        if isinstance(b, IntervalArray):
+            return NotImplemented
+
+        return Interval._make(self.left-b.right, self.right-b.left) # [a,b]-[c,d] = [a-d,b-c]
 
     def __mul__(self, b):
-        if not inspect.isclass(b) and type(b) in (float,int):
+        if type(b) in REAL:
             b = Interval(b,b)
+        elif isinstance(b, IntervalArray):
+            return NotImplemented
 
-        # Creating a list of a*c, a*d, b*c, b*d & finding the minimum and maximum
+        # Finding the minimum and maximum of a*c, a*d, b*c, b*d
         # [a,b]*[c,d] = [min(ac,ad,bc,bd),max(ac,ad,bc,bd)]
-        ls = [self.left*b.left, self.left*b.right, self.right*b.left, self.right*b.right]
-        res = Interval(min(ls), max(ls))
-        
-        if not inf_check(res):
-            return res
-        else:
-            raise ValueError("Either end of the interval is infinity.")
+        ac, ad, bc, bd = self.left*b.left, self.left*b.right, self.right*b.left, self.right*b.right
+        return Interval._make(min(ac,ad,bc,bd), max(ac,ad,bc,bd))
 
     def __truediv__(self, b):
-        if not inspect.isclass(b) and type(b) in (float,int):
+        if type(b) in REAL:
             b = Interval(b,b)
+        elif isinstance(b, IntervalArray):
+            return NotImplemented
 
         if not b.left == 0 and not b.right == 0: # TASK 6 Division by zero check.
-            # Creating a list of a/c, a/d, b/c, b/d & finding the minimum and maximum
+            # Finding the minimum and maximum of a/c, a/d, b/c, b/d
             # [a,b]/[c,d] = [min(a/c,a/d,b/c,b/d),max(a/c,a/d,b/c,b/d)]   
-            results = [self.left/b.left, self.left/b.right, self.right/b.left, self.right/b.right]
-            res = Interval(min(results), max(results))
-            
-            if not inf_check(res):
-                return res
-            else:
-                raise ValueError("Either end of the interval is infinity.")
+            ac, ad, bc, bd = self.left/b.left, self.left/b.right, self.right/b.left, self.right/b.right
+            return Interval._make(min(ac,ad,bc,bd), max(ac,ad,bc,bd))
         else:
             raise ValueError("A division by zero occured.") # If any division by 0, raise error.
     
@@ -96,62 +129,46 @@ class Interval:
         Interval object as 'self' and the number as 'b'.
     """
     def __radd__(self, b):
-        if not inspect.isclass(b) and type(b) in (float,int):
-            b = Interval(b,b)
-
-        res = Interval((self.left+b.left),(self.right+b.right)) # The order for addition does not matter.
-        
-        if not inf_check(res):
-            return res
-        else:
-            raise ValueError("Either end of the interval is infinity.")
+        return self.__add__(b) # The order for addition does not matter.
 
     def __rsub__(self, b):
-        if not inspect.isclass(b) and type(b) in (float,int):
+        if type(b) in REAL:
             b = Interval(b,b)
         
         # IMPORTANT: for the reverse sub, we must flip the self left/right and the b left/right,
         # Since in subtraction the order of numbers matters.
-        res = Interval((b.left-self.right),(b.right-self.left))
-        
-        if not inf_check(res):
-            return res
-        else:
-            raise ValueError("Either end of the interval is infinity.")
+        return Interval._make(b.left-self.right, b.right-self.left)
 
     def __rmul__(self, b):
-        if not inspect.isclass(b) and type(b) in (float,int):
-            b = Interval(b,b)
-
-        ls = [self.left*b.left, self.left*b.right, self.right*b.left, self.right*b.right]
-        res = Interval(min(ls), max(ls))
-        
-        if not inf_check(res):
-            return res
-        else:
-            raise ValueError("Either end of the interval is infinity.")
+        return self.__mul__(b) # The order for multiplication does not matter either.
     
     # Task 9 - Implement the power function
     def __pow__(self, b):
 
-        if type(b) in (float,int): # Check whether b is a real number.
-
-            res = Interval(self.left**b,self.right**b)
-            
-            if not inf_check(res):
-                return res
-            else:
-                raise ValueError("Either end of the interval is infinity.")
+        if type(b) in REAL: # Check whether b is a real number.
+            # A negative power of 0 is a division by zero, and around 0 the power has no upper bound.
+            if b < 0 and self.left <= 0 <= self.right:
+                raise ValueError("A division by zero occured.")
+            # A power can give a complex number (e.g. a negative number to the power 0.5),
+            # so the powers of the endpoints go through the checks of __init__ as well.
+            res = Interval(self.left**b, self.right**b)
+            # x^b does not always grow with x: it shrinks for b < 0, and for an even b also for x < 0.
+            # So the result goes from the lowest to the highest of the two powers, and an even power of
+            # an interval around 0 goes down to 0 (e.g. [-2,2]**2 = [0,4], not [4,4]).
+            left, right = min(res.left, res.right), max(res.left, res.right)
+            if b > 0 and b % 2 == 0 and self.left < 0 < self.right:
+                left = 0
+            return Interval._make(left, right)
         else:
             raise ValueError("The power was not a real number.") # If not b in R, raise error.
     
     # Task 3 - Provide a print method so that the code prints [a,b]
     """
        A __repr__ method will work perfectly fine here. I created a string representation
-       Of a list of the attributes of the Interval object to achieve this.
+       Of a list of the endpoints of the Interval object to achieve this.
     """
     def __repr__(self):
-        return str(list(vars(self).values()))
+        return str([self.left, self.right])
 
     # Task 5 - Create a __contains__ method to check if a number is in an interval.
     """
@@ -165,6 +182,213 @@ class Interval:
         else:
             return False
 
+# Array-backed intervals
+"""
+    For evaluating the same arithmetic on many intervals, creating one Interval object
+    per interval (and per intermediate result) is slow. IntervalArray instead stores
+    all left endpoints in one numpy array and all right endpoints in another, so that
+    every operation is a handful of numpy calls on the whole array at once.
+    The operations follow the same rules as the ones of Interval.
+"""
+class IntervalArray:
+
+    # Make numpy hand operations like 'ndarray + IntervalArray' to the methods below,
+    # instead of applying them to every element of the ndarray on its own.
+    __array_ufunc__ = None
+
+    # The rounding policy for the results of arithmetic, like for Interval. With 'outward', numpy's nextafter
+    # is applied to the whole arrays of endpoints, once per operation.
+    rounding = 'nearest'
+
+    @classmethod
+    def set_rounding(cls, rounding):
+        if rounding not in ROUNDING:
+            raise ValueError(f"The rounding must be one of {ROUNDING}.")
+        cls.rounding = rounding
+
+    def __init__(self,left,right=None):
+
+        if right is None: # Like Interval, only giving left values makes degenerative intervals.
+            right = left
+
+        try:
+            left = np.array(left, dtype=float)
+            right = np.array(right, dtype=float)
+        except (TypeError, ValueError):
+            raise ValueError("The values for either the left or right endpoints was not a real number.")
+
+        # Both endpoint arrays get the same shape, so that [a_i,b_i] is made from left[i] and right[i].
+        self.left, self.right = np.broadcast_arrays(left, right)
+
+    @classmethod
+    def from_intervals(cls, intervals): # Collect a list of Interval objects into one IntervalArray.
+        return cls([a.left for a in intervals], [a.right for a in intervals])
+
+    def __len__(self):
+        return len(self.left)
+
+    def __getitem__(self, i):
+        if np.ndim(self.left[i]) == 0:
+            return Interval(float(self.left[i]), float(self.right[i])) # A single interval.
+        return IntervalArray(self.left[i], self.right[i])
+
+    def _endpoints(self, b):
+        # Returns the left and right endpoints of b, which can be an IntervalArray, an Interval,
+        # or real numbers (which are treated as degenerative intervals, like in Interval).
+        if isinstance(b, (IntervalArray, Interval)):
+            return b.left, b.right
+        try:
+            b = np.asarray(b, dtype=float)
+        except (TypeError, ValueError):
+            raise ValueError("The other operand was not an interval or a real number.")
+        return b, b
+
+    def _checked(self, left, right):
+        if self.rounding == 'outward':
+            left = np.nextafter(left, -INF)
+            right = np.nextafter(right, INF)
+        res = IntervalArray(left, right)
+        if np.any(res.left == float('inf')) or np.any(res.right == float('inf')):
+            raise ValueError("Either end of the interval is infinity.")
+        return res
+
+    def __add__(self, b):
+        b_left, b_right = self._endpoints(b)
+        return self._checked(self.left+b_left, self.right+b_right) # [a,b]+[c,d] = [a+c,b+d]
+
+    def __sub__(self, b):
+        b_left, b_right = self._endpoints(b)
+        return self._checked(self.left-b_right, self.right-b_left) # [a,b]-[c,d] = [a-d,b-c]
+
+    def __mul__(self, b):
+        b_left, b_right = self._endpoints(b)
+        # [a,b]*[c,d] = [min(ac,ad,bc,bd),max(ac,ad,bc,bd)], taking the min and max over all 4 arrays of products.
+        ac, ad, bc, bd = self.left*b_left, self.left*b_right, self.right*b_left, self.right*b_right
+        return self._checked(np.minimum(np.minimum(ac,ad), np.minimum(bc,bd)),
+                             np.maximum(np.maximum(ac,ad), np.maximum(bc,bd)))
+
+    def __truediv__(self, b):
+        b_left, b_right = self._endpoints(b)
+        if np.any(b_left == 0) or np.any(b_right == 0): # Division by zero check, like in Interval.
+            raise ValueError("A division by zero occured.")
+        # [a,b]/[c,d] = [min(a/c,a/d,b/c,b/d),max(a/c,a/d,b/c,b/d)]
+        ac, ad, bc, bd = self.left/b_left, self.left/b_right, self.right/b_left, self.right/b_right
+        return self._checked(np.minimum(np.minimum(ac,ad), np.minimum(bc,bd)),
+                             np.maximum(np.maximum(ac,ad), np.maximum(bc,bd)))
+
+    # The order does not matter for addition and multiplication.
+    __radd__ = __add__
+    __rmul__ = __mul__
+
+    def __rsub__(self, b):
+        b_left, b_right = self._endpoints(b)
+        return self._checked(b_left-self.right, b_right-self.left)
+
+    def __rtruediv__(self, b):
+        return IntervalArray(*self._endpoints(b)) / self
+
+    def __pow__(self, b):
+        if type(b) in (float,int): # Check whether b is a real number.
+            # Like for Interval, a negative power around 0 is a division by zero, the powers of the endpoints
+            # are put in order, and an even power of an interval around 0 goes down to 0.
+            if b < 0 and np.any((self.left <= 0) & (0 <= self.right)):
+                raise ValueError("A division by zero occured.")
+            with np.errstate(invalid='ignore'):
+                left, right = self.left**b, self.right**b
+            # A negative endpoint to a fractional power is complex, which Interval also refuses.
+            if np.any(np.isnan(left) | np.isnan(right)):
+                raise ValueError("The values for either the left or right endpoints was not a real number.")
+            left, right = np.minimum(left, right), np.maximum(left, right)
+            if b > 0 and b % 2 == 0:
+                left = np.where((self.left < 0) & (0 < self.right), 0.0, left)
+            return self._checked(left, right)
+        else:
+            raise ValueError("The power was not a real number.")
+
+    def __repr__(self):
+        return str(np.stack([self.left, self.right], axis=-1).tolist())
+
+    def contains(self, num):
+        """
+            Returns an array of booleans, which is True where num is in the interval.
+            (The 'in' operator can only give a single boolean, so it is not used here.)
+        """
+        return (self.left <= num) & (num <= self.right)
+
+    def __contains__(self, num):
+        # Without this, 'in' would compare num with the Interval objects from __getitem__ and always give False.
+        raise TypeError("'in' is ambiguous for an IntervalArray, use contains(num) for the boolean of each interval.")
+
+# Polynomials of intervals
+"""
+    Evaluating a polynomial term by term, like 3*(I**3)-2*(I**2)-5*I-1 in task 10, treats every
+    occurence of I as an independent interval (the dependency problem), so the result is much wider
+    than the actual range of the polynomial over I. It also creates an Interval for every power and product.
+    IntervalPolynomial prepares the evaluation once for a list of coefficients, and then evaluates it
+    on an Interval, a list of Intervals or an IntervalArray, using one of these forms:
+        * 'horner': p(I) = (...((c_0*I + c_1)*I + c_2)...)*I + c_n, which needs only n products and n sums.
+        * 'centered': p(I) = p(m) + p'(I)*(I-m), with m the midpoint of I (the mean value form),
+          which is tighter than the Horner form for narrow intervals.
+        * 'best': the intersection of both, since both of them contain the range of p over I.
+"""
+class IntervalPolynomial:
+
+    forms = ('horner','centered','best')
+
+    def __init__(self, coeffs, form='horner'):
+        """
+            `coeffs`: The coefficients c_0, c_1, ..., c_n of p(x) = c_0*x^n + c_1*x^(n-1) + ... + c_n,
+            so the highest power first (like numpy.polyval).
+
+            `form`: The form to evaluate the polynomial in: 'horner', 'centered' or 'best'.
+        """
+        if form not in self.forms:
+            raise ValueError(f"The form must be one of {self.forms}.")
+        try:
+            self.coeffs = [float(c) for c in coeffs]
+        except (TypeError, ValueError):
+            raise ValueError("The coefficients were not real numbers.")
+        if not self.coeffs:
+            raise ValueError("A polynomial needs at least one coefficient.")
+        self.form = form
+
+        # The coefficients of p'(x), for the centered form.
+        n = len(self.coeffs) - 1
+        self.derivative = [c*(n-i) for i, c in enumerate(self.coeffs[:-1])] or [0.0]
+
+    def __repr__(self):
+        return f"IntervalPolynomial({self.coeffs}, form='{self.form}')"
+
+    @staticmethod
+    def _horner(coeffs, x):
+        # Works for a real number, an array of real numbers, an Interval and an IntervalArray alike.
+        if len(coeffs) == 1:
+            return 0*x + coeffs[0]
+        res = coeffs[0]*x + coeffs[1]
+        for c in coeffs[2:]:
+            res = res*x + c
+        return res
+
+    def _centered(self, x):
+        # p(m) is also evaluated with interval arithmetic (on [m,m]), so that it is rounded like the rest.
+        mid = (x.left + x.right)/2
+        p_mid = self._horner(self.coeffs, IntervalArray(mid) if isinstance(x, IntervalArray) else Interval(mid))
+        return p_mid + self._horner(self.derivative, x)*(x - mid)
+
+    def __call__(self, x):
+        if isinstance(x, (list, tuple)): # A batch of Interval objects is evaluated as one IntervalArray.
+            x = IntervalArray.from_intervals(x)
+        if self.form == 'horner':
+            return self._horner(self.coeffs, x)
+        if self.form == 'centered':
+            return self._centered(x)
+
+        a = self._horner(self.coeffs, x)
+        b = self._centered(x)
+        if isinstance(a, IntervalArray):
+            return IntervalArray(np.maximum(a.left, b.left), np.minimum(a.right, b.right))
+        return Interval(max(a.left, b.left), min(a.right, b.right))
+
 def task_3(): # Task 3 testing. (Also 1 and 2)
     print(Interval(1,3))
 
@@ -221,24 +445,117 @@ def task_9(): # Task 9 testing.
     print(x**2,x**3)
 
 def task_10(): # Task 10 testing.
-    # Creating a list of 1000 intervals (a,a+0.5) for a in [0,1]
-    ints_x = [Interval(a,a+0.5) for a in np.linspace(0,1,1000)]
-    # Creating a list of p(I)=3I^3-2I^2-5I-1 for the list of intervals.
-    ints_y = [((3*(a**3))-(2*(a**2))-(5*a)-1) for a in ints_x]
+    # Creating an array of 1000 intervals (a,a+0.5) for a in [0,1]
+    a = np.linspace(0,1,1000)
+    ints_x = IntervalArray(a,a+0.5)
+    # Computing p(I)=3I^3-2I^2-5I-1 for the whole array of intervals at once.
+    ints_y = (3*(ints_x**3))-(2*(ints_x**2))-(5*ints_x)-1
 
     # Plotting lower & upper y bounds (y_l and y_u) against only the lower bound of
     # the x-values (i.e. the left end of the interval.)
-    plt.plot([a.left for a in ints_x], [a.left for a in ints_y])
-    plt.plot([a.left for a in ints_x], [a.right for a in ints_y])
+    render.plot(ints_x.left, ints_y.left)
+    render.plot(ints_x.left, ints_y.right)
 
     # Labels & show graph.
     plt.title("p(I)=3I^3-2I^2-5I-1, I = Interval(x,x+0.5)")
     plt.xlabel("x")
     plt.ylabel("p(I)")
-    plt.show()
+    render.show("interval_task_10")
+
+def task_11(): # Microbenchmark of the __slots__ Interval and its fast construction path.
+    n = 100000
+    lefts = np.linspace(0,1,n).tolist()
+
+    # A subclass without __slots__ gets a __dict__ per instance again, like the original Interval had.
+    DictInterval = type('DictInterval', (Interval,), {})
+
+    # Memory allocated per instance, measured with tracemalloc.
+    for cls in (Interval, DictInterval):
+        tracemalloc.start()
+        ints = [cls(a,a+0.5) for a in lefts]
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{cls.__name__}: {size/n:.0f} bytes allocated per interval")
+        del ints
+
+    # Time of creating the intervals through __init__ compared to the unchecked _make() used by the arithmetic.
+    for name, make in [("Interval(a,b)", Interval), ("Interval._make(a,b)", Interval._make)]:
+        start = time.perf_counter()
+        for a in lefts:
+            make(a,a+0.5)
+        print(f"{name}: {(time.perf_counter()-start)/n*1e9:.0f} ns per interval")
+
+    # Time of evaluating p(I)=3I^3-2I^2-5I-1 (as in task 10), which creates 10 intervals per evaluation.
+    ints = [Interval(a,a+0.5) for a in lefts]
+    start = time.perf_counter()
+    for a in ints:
+        (3*(a**3))-(2*(a**2))-(5*a)-1
+    print(f"p(I): {(time.perf_counter()-start)/n*1e6:.2f} µs per interval")
+
+def task_12(): # Comparing the forms of IntervalPolynomial with the evaluation of task 10.
+    a = np.linspace(0,1,1000)
+    ints_x = IntervalArray(a,a+0.5)
+    coeffs = [3,-2,-5,-1] # p(I)=3I^3-2I^2-5I-1
+
+    # The term by term evaluation of task 10, followed by the three forms of IntervalPolynomial.
+    evaluations = [("term by term", lambda x: (3*(x**3))-(2*(x**2))-(5*x)-1)]
+    evaluations += [(form, IntervalPolynomial(coeffs, form)) for form in IntervalPolynomial.forms]
+
+    for name, p in evaluations:
+        ints_y = p(ints_x)
+        start = time.perf_counter()
+        for _ in range(100):
+            p(ints_x)
+        print(f"{name}: mean width {np.mean(ints_y.right - ints_y.left):.4f}, {(time.perf_counter()-start)*10:.3f} ms per evaluation")
+
+    # The exact range of p over every interval, from a fine sampling, for comparison.
+    samples = a[:,None] + np.linspace(0,0.5,501)
+    values = np.polyval(coeffs, samples)
+    print(f"exact range: mean width {np.mean(values.max(axis=1) - values.min(axis=1)):.4f}")
+
+    # Plotting the bounds of the tightest form against the left end of the x-intervals, like in task 10.
+    ints_y = IntervalPolynomial(coeffs, 'best')(ints_x)
+    render.plot(a, ints_y.left)
+    render.plot(a, ints_y.right)
+    render.plot(a, values.min(axis=1), 'k--', label="exact range")
+    render.plot(a, values.max(axis=1), 'k--')
+    plt.title("p(I)=3I^3-2I^2-5I-1 with IntervalPolynomial, I = Interval(x,x+0.5)")
+    plt.xlabel("x")
+    plt.ylabel("p(I)")
+    plt.legend()
+    render.show("interval_task_12")
+
+def task_13(): # Comparing the 'nearest' and 'outward' rounding policies.
+    # Adding 0.1 ten times. The exact sum of these floats is computed with fractions, to check if it is in the result.
+    exact = 10*Fraction(0.1)
+    for rounding in ROUNDING:
+        Interval.set_rounding(rounding)
+        res = Interval(0)
+        for _ in range(10):
+            res = res + Interval(0.1)
+        print(f"{rounding}: 0.1+...+0.1 = {res}, contains the exact sum: {Fraction(res.left) <= exact <= Fraction(res.right)}")
+
+    # The cost of the rounding for p(I)=3I^3-2I^2-5I-1 on 10^6 intervals, applied once per array operation.
+    a = np.linspace(0,1,10**6)
+    ints_x = IntervalArray(a,a+0.5)
+    for rounding in ROUNDING:
+        IntervalArray.set_rounding(rounding)
+        start = time.perf_counter()
+        ints_y = (3*(ints_x**3))-(2*(ints_x**2))-(5*ints_x)-1
+        print(f"{rounding}: p(I) on 10^6 intervals in {(time.perf_counter()-start)*1000:.1f} ms")
+
+    Interval.set_rounding('nearest')
+    IntervalArray.set_rounding('nearest')
 
 # Some code to be able to select any task to run.
-def main():
+def main(argv=None):
+    # A task given on the command line (e.g. `python3 -m NUMA01.homework_2_classes_and_interval_arithmetic 10`) is run without asking for input.
+    parser = argparse.ArgumentParser(description="Classes and interval arithmetic.")
+    parser.add_argument('task', nargs='?', type=int, choices=range(3,14), metavar='task', help="the task to run, from 3 to 13 (if not given, tasks are selected in the terminal)")
+    args = parser.parse_args(argv)
+    if args.task is not None:
+        globals()[f"task_{args.task}"]()
+        return
 
     run = True
     while run:
@@ -247,9 +564,10 @@ def main():
         if txt == 'stb':
             run = False
         else:
-            if int(txt) in range(3,11):
+            if int(txt) in range(3,14):
                 exec(f"task_{txt}()")
             else:
                 print("Invalid task.")
 
-main()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
\ No newline at end of file
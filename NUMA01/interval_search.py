@@ -0,0 +1,167 @@
+import heapq, time, numpy as np
+from .homework_2_classes_and_interval_arithmetic import Interval, IntervalArray, IntervalPolynomial
+
+"""
+    Branch and bound with interval arithmetic.
+
+    If f is evaluated with interval arithmetic on a box (an interval of x values), the result
+    contains every value f takes on that box. So if 0 is not in f(box), f has no root in the box,
+    and if the lower end of f(box) is above a value f is known to reach, the box cannot contain
+    the minimum of f. Such boxes are thrown away (pruned), and the others are bisected, until
+    the boxes that are left are narrower than some tolerance.
+
+    `f` can be anything that takes an Interval and returns an Interval, such as an IntervalPolynomial
+    or a function written with the Interval operators. For the batched mode it must also take an
+    IntervalArray, in which case all live boxes of a generation are evaluated as one array operation.
+
+    A box is also finished once it is only one float wide, even if `tol` is smaller than that (or 0),
+    since its midpoint then rounds to one of its ends and bisecting it would give the box itself again.
+"""
+
+def _merge(lefts, rights):
+    # Joins boxes that touch each other into one box, so every root gives a single box.
+    merged = []
+    for left, right in sorted(zip(lefts, rights)):
+        if merged and left <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], right)
+        else:
+            merged.append([left, right])
+    return [Interval(left, right) for left, right in merged]
+
+def find_roots(f, domain, tol=1e-8, batched=False, max_boxes=10**6):
+    """
+        Finds boxes of width at most `tol` that contain every root of f in `domain`.\n
+
+        `f`: The function, evaluated with interval arithmetic.
+
+        `domain`: The Interval to search in.
+
+        `tol`: The width below which boxes are not bisected anymore.
+
+        `batched`: If True, all live boxes are evaluated at once as an IntervalArray.
+
+        `max_boxes`: The maximum number of live boxes, after which a ValueError is raised.
+
+        Returns a list of Intervals. Every root is in one of them, but a box can also be kept
+        because the interval evaluation is too wide to rule it out.
+    """
+    if batched:
+        lefts, rights = np.array([domain.left], dtype=float), np.array([domain.right], dtype=float)
+        done_lefts, done_rights = [], []
+        while len(lefts):
+            # Throw away all boxes for which 0 is not in f(box).
+            y = f(IntervalArray(lefts, rights))
+            keep = (y.left <= 0) & (0 <= y.right)
+            lefts, rights = lefts[keep], rights[keep]
+
+            # Boxes narrower than tol (or one float wide) are finished, the others are bisected.
+            mids = (lefts + rights)/2
+            narrow = (rights - lefts <= tol) | (mids == lefts) | (mids == rights)
+            done_lefts.extend(lefts[narrow])
+            done_rights.extend(rights[narrow])
+            lefts, rights, mids = lefts[~narrow], rights[~narrow], mids[~narrow]
+            if 2*len(lefts) > max_boxes:
+                raise ValueError("The number of boxes exceeded max_boxes.")
+            lefts, rights = np.concatenate([lefts, mids]), np.concatenate([mids, rights])
+        return _merge(done_lefts, done_rights)
+
+    # The work queue holds the widest box first, so the search is spread evenly over the domain.
+    queue = [(-(domain.right - domain.left), 0, domain)]
+    count = 1 # Tie breaker for boxes of equal width, since Intervals cannot be compared.
+    done_lefts, done_rights = [], []
+    while queue:
+        _, _, box = heapq.heappop(queue)
+        if 0 not in f(box):
+            continue
+        mid = (box.left + box.right)/2
+        if box.right - box.left <= tol or mid == box.left or mid == box.right:
+            done_lefts.append(box.left)
+            done_rights.append(box.right)
+            continue
+        if len(queue) + 2 > max_boxes:
+            raise ValueError("The number of boxes exceeded max_boxes.")
+        for half in (Interval(box.left, mid), Interval(mid, box.right)):
+            heapq.heappush(queue, (-(half.right - half.left), count, half))
+            count += 1
+    return _merge(done_lefts, done_rights)
+
+def find_minimum(f, domain, tol=1e-8, batched=False, max_boxes=10**6):
+    """
+        Finds the global minimum of f over `domain`.\n
+
+        `f`: The function, evaluated with interval arithmetic.
+
+        `domain`: The Interval to search in.
+
+        `tol`: The width below which boxes are not bisected anymore.
+
+        `batched`: If True, all live boxes are evaluated at once as an IntervalArray.
+
+        `max_boxes`: The maximum number of live boxes, after which a ValueError is raised.
+
+        Returns a tuple of an Interval that contains the minimum value of f, and an Interval
+        that contains every x in `domain` where it is reached.
+    """
+    # best is the lowest value of f found at a point so far, so the minimum is at most best.
+    if batched:
+        lefts, rights = np.array([domain.left], dtype=float), np.array([domain.right], dtype=float)
+        best = float('inf')
+        while True:
+            y = f(IntervalArray(lefts, rights))
+            mids = (lefts + rights)/2
+            best = min(best, float(np.min(f(IntervalArray(mids)).right)))
+
+            # Throw away all boxes whose lowest possible value is above best.
+            keep = y.left <= best
+            lefts, rights, lower, mids = lefts[keep], rights[keep], y.left[keep], mids[keep]
+
+            # Only the boxes that are still too wide (and more than one float wide) are bisected.
+            wide = (rights - lefts > tol) & (lefts < mids) & (mids < rights)
+            if not np.any(wide):
+                return Interval(float(np.min(lower)), best), Interval(float(np.min(lefts)), float(np.max(rights)))
+            if 2*len(lefts) > max_boxes:
+                raise ValueError("The number of boxes exceeded max_boxes.")
+
+            mids = mids[wide]
+            lefts = np.concatenate([lefts[~wide], lefts[wide], mids])
+            rights = np.concatenate([rights[~wide], mids, rights[wide]])
+
+    # The work queue holds the box with the lowest possible value of f first.
+    y = f(domain)
+    queue = [(y.left, 0, domain)]
+    count = 1 # Tie breaker for boxes with equal lower bounds, since Intervals cannot be compared.
+    best = f(Interval((domain.left + domain.right)/2)).right
+    while True:
+        lower, _, box = heapq.heappop(queue)
+        # Since the queue is ordered by lower bound, the first narrow box holds the minimum, and no other box goes lower.
+        mid = (box.left + box.right)/2
+        if box.right - box.left <= tol or mid == box.left or mid == box.right:
+            # Every box left in the queue that can still go below best could also contain a minimizer.
+            boxes = [box] + [b for l, _, b in queue if l <= best]
+            return Interval(lower, best), Interval(min(b.left for b in boxes), max(b.right for b in boxes))
+        if len(queue) + 2 > max_boxes:
+            raise ValueError("The number of boxes exceeded max_boxes.")
+
+        best = min(best, f(Interval(mid)).right)
+        for half in (Interval(box.left, mid), Interval(mid, box.right)):
+            y = f(half)
+            if y.left <= best:
+                heapq.heappush(queue, (y.left, count, half))
+                count += 1
+
+def main(): # Finding the roots and minimum of the polynomial of task 10, p(x)=3x^3-2x^2-5x-1.
+    p = IntervalPolynomial([3,-2,-5,-1], 'best')
+    domain = Interval(-2,3)
+    print(f"p(x) = 3x^3-2x^2-5x-1 on {domain}, numpy.roots: {sorted(np.roots([3,-2,-5,-1]))}")
+
+    for batched in (False, True):
+        mode = "batched" if batched else "work queue"
+        start = time.perf_counter()
+        roots = find_roots(p, domain, tol=1e-10, batched=batched)
+        print(f"Roots ({mode}, {(time.perf_counter()-start)*1000:.1f} ms): {roots}")
+        start = time.perf_counter()
+        value, x = find_minimum(p, domain, tol=1e-10, batched=batched)
+        print(f"Minimum ({mode}, {(time.perf_counter()-start)*1000:.1f} ms): p(x) in {value} for x in {x}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import argparse, math, time
+from decimal import Decimal, localcontext
+from fractions import Fraction
+from lu_work import instrument
+
+"""
+    Natural logarithm to any number of digits, with the arithmetic-geometric mean (AGM).
+
+    Carlsson's iteration in homework 1 gains a fixed number of digits per step (even accelerated, the
+    number of steps grows like the square root of the number of digits), which is fine for double precision.
+    For thousands of digits, the AGM formula
+
+        ln(s) = π / (2 AGM(1, 4/s)) + O(ln(s)/s^2)
+
+    is much faster, since the AGM converges quadratically: every step doubles the number of correct digits,
+    so p bits take about log2(p) steps. To make s large enough, x is scaled to s = x * 2^m > 2^(p/2), so that
+
+        ln(x) = π / (2 AGM(1, 4/s)) - m ln(2).
+
+    All numbers are fixed point: Python integers that stand for the integer times 2^-wp, where wp is the
+    working precision in bits. Sums are integer sums, products are shifted back by wp bits, and square roots
+    are math.isqrt(), all of which are exact up to the last bit. π (from the Gauss-Legendre AGM) and ln(2)
+    (from the formula above with x = 1) are computed once, at the highest precision asked for so far, and
+    shifted down for lower precisions.
+"""
+
+LOG2_10 = math.log2(10)
+
+# The cached constants, as (working precision, value at that precision).
+_pi_cache = (0, 0)
+_ln2_cache = (0, 0)
+
+def _to_fraction(x):
+    # Ints, floats, Decimals, Fractions and strings like '1.41' or '1/3' are all converted exactly.
+    x = Fraction(x)
+    if x <= 0:
+        # Raise an error if x is not greater than 0.
+        raise ValueError("Input must be greater than 0.")
+    return x
+
+def _log2_floor(x):
+    # floor(log2(x)) of a positive Fraction, possibly 1 too low.
+    return x.numerator.bit_length() - x.denominator.bit_length() - 1
+
+def _working_precision(x, digits):
+    # The bits needed for `digits` digits, plus as many as ln(x) has leading zeros (since ln(x) = x-1 close to 1,
+    # and the result comes from subtracting numbers of size 1), plus guard bits for the rounding errors of the steps.
+    bits = int(digits*LOG2_10) + 1 + max(0, -_log2_floor(abs(x-1)))
+    return bits + bits.bit_length() + 16
+
+def _to_decimal(value, wp, digits):
+    # The fixed point value * 2^-wp, rounded to `digits` significant digits.
+    with localcontext() as context:
+        context.prec = digits + 10
+        result = Decimal(value) / Decimal(2)**wp
+        context.prec = digits
+        return +result
+
+def agm(a, b, wp):
+    """
+        Computes the arithmetic-geometric mean of the fixed point numbers `a` and `b` (with `wp` fraction bits), by:
+            * Replacing a and b by (a+b)/2 and sqrt(ab), until they differ by at most 1 in the last bit.
+        Returns the AGM as a fixed point number.
+    """
+    iterations = 0
+    while abs(a - b) > 1:
+        a, b = (a + b) >> 1, math.isqrt(a * b)
+        iterations += 1
+    instrument.count("agm", "iterations", iterations)
+    return a
+
+def pi_fixed(wp):
+    """
+        Computes π as a fixed point number with `wp` fraction bits, with the Gauss-Legendre algorithm:
+            * Starting from a = 1, b = 1/sqrt(2), t = 1/4, and making a, b the next AGM step, while
+              subtracting 2^k (a_k - a_k+1)^2 from t.
+            * Returning (a+b)^2 / 4t once a and b agree.
+        The result is cached, so π is only computed again for a higher precision.
+    """
+    global _pi_cache
+    cached_wp, cached = _pi_cache
+    if cached_wp >= wp:
+        return cached >> (cached_wp - wp)
+
+    guard = wp.bit_length() + 8
+    p = wp + guard
+    one = 1 << p
+    a, b, t, k = one, math.isqrt(1 << (2*p - 1)), one >> 2, 0
+    while abs(a - b) > 1:
+        next_a = (a + b) >> 1
+        b = math.isqrt(a * b)
+        t -= ((a - next_a)**2 >> p) << k
+        a = next_a
+        k += 1
+    value = (a + b)**2 // (4*t)
+    _pi_cache = (p, value)
+    return value >> guard
+
+def ln2_fixed(wp):
+    """
+        Computes ln(2) as a fixed point number with `wp` fraction bits, as ln(2^m)/m = π / (2m AGM(1, 4/2^m)),
+        with 2^m > 2^(wp/2). The result is cached, so ln(2) is only computed again for a higher precision.
+    """
+    global _ln2_cache
+    cached_wp, cached = _ln2_cache
+    if cached_wp >= wp:
+        return cached >> (cached_wp - wp)
+
+    guard = wp.bit_length() + 8
+    p = wp + guard
+    m = p//2 + 8
+    # The AGM is computed with m/2 more bits, since it magnifies the rounding errors of its first steps (see agm_ln()).
+    q = p + m//2 + 16
+    value = ((pi_fixed(q) << q) // (2*m*agm(1 << q, 1 << (q + 2 - m), q))) >> (q - p)
+    _ln2_cache = (p, value)
+    return value >> guard
+
+@instrument.timed("agm_ln")
+def agm_ln(x, digits=50):
+    """
+        Computes `ln(x)` to `digits` significant digits with the AGM formula.\n
+
+        `x`: The value of which to compute the natural logarithm, as an int, float, Decimal, Fraction or a string
+        (like '1.41'). Must be greater than 0. It is used exactly, so 1.41 is the float closest to 1.41, and '1.41' is 1.41.
+
+        `digits`: The number of significant digits of the result.
+
+        Returns a Decimal.
+    """
+    x = _to_fraction(x)
+    if x == 1:
+        return Decimal(0)
+    wp = _working_precision(x, digits)
+
+    # Scale x to s = x 2^m > 2^(wp/2 + 8), and compute 4/s = 4 q / (p 2^m) for x = p/q as a fixed point number.
+    # Since 4/s < 2^-(wp/2), it only has wp bits of its own if the AGM is computed with wp/2 more bits. That also
+    # covers the first AGM steps, which magnify their rounding errors by about 1/sqrt(b) = sqrt(s)/2.
+    m = wp//2 + 8 - _log2_floor(x)
+    p = wp + wp//2 + 16
+    if m >= 0:
+        inverse = (4*x.denominator << p) // (x.numerator << m)
+    else:
+        inverse = (4*x.denominator << (p - m)) // x.numerator
+    ln_s = (pi_fixed(p) << p) // (2*agm(1 << p, inverse, p))
+    return _to_decimal(ln_s - m*ln2_fixed(p), p, digits)
+
+@instrument.timed("carlsson_ln")
+def carlsson_ln(x, digits=50):
+    """
+        Computes `ln(x)` to `digits` significant digits with the accelerated method of B.C. Carlsson from homework 1
+        (fast_approx_ln()), in fixed point, adding steps until the accelerated value d(i,i) no longer changes.
+        It is here for comparison with agm_ln(), and works best for x close to 1.\n
+
+        `x`: The value of which to compute the natural logarithm, like for agm_ln().
+
+        `digits`: The number of significant digits of the result.
+
+        Returns a Decimal.
+    """
+    x = _to_fraction(x)
+    if x == 1:
+        return Decimal(0)
+    # x itself needs as many more bits as it has leading zeros.
+    wp = _working_precision(x, digits) + max(0, -_log2_floor(x))
+    one = 1 << wp
+    x_fixed = (x.numerator << wp) // x.denominator
+
+    # Initialize a_0 and g_0, and build the table one row at a time, like fast_approx_ln() with a tolerance.
+    # d(k,i) = (d(k-1,i) - 4^-k d(k-1,i-1)) / (1 - 4^-k) = (4^k d(k-1,i) - d(k-1,i-1)) / (4^k - 1) only needs
+    # a shift and a division by a small integer.
+    a = (one + x_fixed) >> 1
+    g = math.isqrt(x_fixed << wp)
+    row = [a]
+    i = 0
+    while True:
+        i += 1
+        a = (a + g) >> 1
+        g = math.isqrt(a * g)
+        next_row = [a]
+        for k in range(1, i+1):
+            next_row.append(((next_row[k-1] << 2*k) - row[k-1]) // ((1 << 2*k) - 1))
+        converged = abs(next_row[i] - row[i-1]) <= 1
+        row = next_row
+        if converged:
+            break
+    instrument.count("carlsson_ln", "iterations", i)
+
+    return _to_decimal(((x_fixed - one) << wp) // row[i], wp, digits)
+
+def decimal_ln(x, digits=50):
+    """
+        Computes `ln(x)` to `digits` significant digits with the decimal module (Decimal.ln), for comparison.
+    """
+    with localcontext() as context:
+        context.prec = digits
+        return Decimal(x).ln()
+
+def _matching_digits(a, b, digits):
+    # The number of leading significant digits in which a and b agree.
+    if a == b:
+        return digits
+    with localcontext() as context:
+        context.prec = digits + 10
+        return max(0, min(digits, int((abs(a).adjusted() - abs(a - b).adjusted()))))
+
+def main(argv=None): # Benchmarking agm_ln() against carlsson_ln() and decimal_ln().
+    parser = argparse.ArgumentParser(description="Benchmark of ln(x) to many digits.")
+    parser.add_argument('digits', nargs='*', type=int, default=[100, 1000, 10000], help="the numbers of digits to compute ln(x) to")
+    parser.add_argument('-x', default='2', help="the x to compute ln(x) for (default 2)")
+    args = parser.parse_args(argv)
+
+    methods = [("AGM", agm_ln), ("Carlsson", carlsson_ln), ("Decimal.ln", decimal_ln)]
+    for digits in args.digits:
+        # The reference is the decimal module's result with extra digits, which is correctly rounded.
+        reference = decimal_ln(args.x, digits + 20)
+        print(f"ln({args.x}) to {digits} digits:")
+        for name, method in methods:
+            if method is agm_ln:
+                # The first call also computes π and ln(2), which are cached for the calls after it.
+                global _pi_cache, _ln2_cache
+                _pi_cache = _ln2_cache = (0, 0)
+                start = time.perf_counter()
+                method(args.x, digits)
+                first = time.perf_counter() - start
+
+            # Take the best of a few runs, for as long as 1 second allows.
+            best, spent, runs = float('inf'), 0, 0
+            while runs < 3 or (spent < 1 and runs < 100):
+                start = time.perf_counter()
+                result = method(args.x, digits)
+                elapsed = time.perf_counter() - start
+                best, spent, runs = min(best, elapsed), spent + elapsed, runs + 1
+                if elapsed > 5:
+                    break
+
+            correct = _matching_digits(reference, result, digits)
+            extra = f" ({first*1000:.2f} ms with π and ln(2))" if method is agm_ln else ""
+            print(f"    {name:10}: {best*1000:10.2f} ms{extra}, {correct} correct digits, {digits/best:,.0f} digits per second")
+
+if __name__ == "__main__":
+    main()
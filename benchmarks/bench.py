@@ -0,0 +1,236 @@
+#!/usr/bin/python3
+# Copyright © 2021 Pim Nelissen.
+# This software is licensed under the MIT license.
+# Read more at https://mit-license.org/.
+
+import argparse
+import gc
+import glob
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+SWEEP_DIR = os.path.join(ROOT, 'FYSB21', 'Signal Analyzer Lab')
+sys.path[:0] = [ROOT, SWEEP_DIR]
+
+from NUMA01 import approx_ln, fast_approx_ln, fast_ln, agm_ln, carlsson_ln, Interval, IntervalArray, IntervalPolynomial
+from MATB22 import LeastSquares, PowerIteration, iterates, solve_surface
+from sweep_cache import load_sweep
+from sweep_fit import fit_rlc
+from sweep_kernels import dbm_to_linear, normalize
+from sweep_reader import read_sweep
+
+'''
+Benchmarks of the numerical hot paths.
+
+Every case builds its input first, from a fixed seed, and then times a single call of the
+code under test. The time is the fastest of a number of runs. One more run is made under
+tracemalloc, which gives the peak memory allocated during the call and the number of memory
+blocks (Python objects and numpy buffers) still allocated after it. E.g.
+
+    python3 benchmarks/bench.py run -o baseline.json           # the default sizes
+    python3 benchmarks/bench.py run --full -o baseline.json    # up to 10^7 points and 2000^2 grids
+    python3 benchmarks/bench.py run -k approx_ln               # only the cases with approx_ln in their name
+    python3 benchmarks/bench.py compare baseline.json new.json
+
+compare lists every case that got slower (or uses more memory) than the baseline by more than
+the tolerance, and exits with status 1 if there is any. Timings are only comparable between
+results from the same machine.
+'''
+
+TOLERANCE = 0.25 # Relative slowdown (or growth in peak memory) that counts as a regression.
+
+def cases(cache_dir, full=False):
+    '''
+    Yields (name, setup) for every benchmark case, where setup() builds the input and returns
+    the function to time, which takes no arguments. With `full`, the largest sizes are included.
+    Sweeps are cached in `cache_dir`.
+    '''
+    points = [10**3, 10**5] + ([10**7] if full else [10**6])
+    # The random input of every size has its own seed, so it does not depend on which cases are run.
+    x_for = lambda size: np.random.default_rng(size).uniform(0.1, 100, size)
+
+    # Carlsson's method and its accelerated form. The accelerated table holds n+1 rows of the
+    # whole array, so n = 30 is only run on 10^6 points with `full`, and not on 10^7 points.
+    for size in points:
+        for n in (10, 30):
+            yield f'approx_ln[x={size},n={n}]', lambda size=size, n=n: (lambda x=x_for(size): approx_ln(x, n))
+    for size in points:
+        for n in (5, 30):
+            if n*size <= (30 if full else 5)*10**6:
+                yield f'fast_approx_ln[x={size},n={n}]', lambda size=size, n=n: (lambda x=x_for(size): fast_approx_ln(x, n))
+    for size in points:
+        yield f'fast_ln[x={size}]', lambda size=size: (lambda x=np.logspace(-300, 300, size): fast_ln(x))
+
+    # ln(2) to many digits, with the AGM and with Carlsson's accelerated method in fixed point.
+    # π and ln(2) are cached by the warm up run, so the AGM times are without them.
+    for digits in [100, 1000] + ([10000] if full else []):
+        yield f'agm_ln[digits={digits}]', lambda digits=digits: (lambda: agm_ln(2, digits))
+        yield f'carlsson_ln[digits={digits}]', lambda digits=digits: (lambda: carlsson_ln(2, digits))
+
+    # p(I)=3I^3-2I^2-5I-1 of task 10, for intervals (a,a+0.5): one Interval at a time, and as an IntervalArray.
+    p_terms = lambda I: (3*(I**3))-(2*(I**2))-(5*I)-1
+    for size in points[:2]:
+        def setup(size=size):
+            intervals = [Interval(a, a+0.5) for a in np.linspace(0, 1, size).tolist()]
+            return lambda: [p_terms(I) for I in intervals]
+        yield f'interval_task_10[intervals={size}]', setup
+    for size in points:
+        def setup(size=size):
+            a = np.linspace(0, 1, size)
+            intervals = IntervalArray(a, a+0.5)
+            return lambda: p_terms(intervals)
+        yield f'interval_array_task_10[intervals={size}]', setup
+        def setup(size=size):
+            a = np.linspace(0, 1, size)
+            intervals, p = IntervalArray(a, a+0.5), IntervalPolynomial([3, -2, -5, -1], 'best')
+            return lambda: p(intervals)
+        yield f'interval_polynomial[intervals={size}]', setup
+
+    # The residual r(a) of MATB22 task 1.3, and the iterate counts of task 2.7.
+    A = np.array([[1, 1, 2], [1, 2, 1], [2, 1, 1], [2, 2, 1]])
+    for size in points:
+        def setup(size=size):
+            a = np.linspace(0, 100, size)
+            ones = np.ones_like(a)
+            least_squares, b = LeastSquares(A), np.array([ones, a, ones, a])
+            return lambda: least_squares.residuals(b)
+        yield f'residual_r_a[a={size}]', setup
+    power_iteration = PowerIteration([[1, 3, 2], [-3, 4, 3], [2, 3, 1]], [8, 3, 12])
+    for size in points:
+        def setup(size=size):
+            v, epsilon = power_iteration.v(200), 10**(-np.linspace(1, 14, size))
+            return lambda: (iterates(power_iteration.v, v, epsilon), iterates(power_iteration.q, power_iteration.q(200), epsilon))
+        yield f'iterates[epsilon={size}]', setup
+
+    # The implicit surface of MATB22 task 3, on grids of up to 2000^2 points.
+    g = lambda x_1, x_2, x_3: 2*x_1**2 - x_2**2 + 2*x_3**2 - 10*x_1*x_2 - 4*x_1*x_3 + 10*x_2*x_3 - 1
+    for side in [20, 200] + ([2000] if full else [1000]):
+        def setup(side=side):
+            X, Y = np.meshgrid(np.linspace(-1, 1, side), np.linspace(-1, 1, side))
+            return lambda: solve_surface(g, X, Y)
+        yield f'solve_surface[grid={side}^2]', setup
+
+    # Parsing the bundled sweeps, loading them from the cache, and fitting the RLC sweep.
+    for path in sorted(glob.glob(os.path.join(SWEEP_DIR, 'data', '*.csv'))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        yield f'parse_sweep[{name}]', lambda path=path: (lambda: read_sweep(path))
+        def setup(path=path):
+            load_sweep(path, cache_dir) # Fill the cache, so that the timed loads read from it.
+            return lambda: load_sweep(path, cache_dir)
+        yield f'load_cached_sweep[{name}]', setup
+    def setup():
+        _, freq, gain = read_sweep(os.path.join(SWEEP_DIR, 'data', 'rlc_data.csv'))
+        freq, gain = freq[4:], normalize(dbm_to_linear(gain[4:]))
+        return lambda: fit_rlc(freq, gain, 100*10**-9)
+    yield 'fit_rlc[rlc_data]', setup
+
+def measure(setup, repeat, min_time=0.2):
+    '''
+    Times the function made by setup(). Returns a dict with the fastest time of `repeat` runs
+    (or more runs, for fast functions, until `min_time` seconds have been spent), the peak
+    memory in bytes and the number of blocks still allocated after one run under tracemalloc.
+    '''
+    function = setup()
+    function() # Warm up, so that first-call costs (imports, caches) are not measured.
+    times = []
+    spent = 0
+    while len(times) < repeat or (spent < min_time and len(times) < 1000):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+        spent += times[-1]
+
+    gc.collect()
+    tracemalloc.start()
+    blocks = len(tracemalloc.take_snapshot().traces)
+    result = function()
+    _, peak = tracemalloc.get_traced_memory()
+    blocks = len(tracemalloc.take_snapshot().traces) - blocks
+    tracemalloc.stop()
+    del result
+    return {'time': min(times), 'median_time': float(np.median(times)), 'runs': len(times),
+            'peak_bytes': peak, 'blocks': blocks}
+
+def run(args):
+    results = {}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for name, setup in cases(cache_dir, args.full):
+            if args.k and not any(pattern in name for pattern in args.k):
+                continue
+            results[name] = measure(setup, args.repeat)
+            r = results[name]
+            print(f"{name:50} {r['time']*1000:10.3f} ms {r['peak_bytes']/2**20:10.2f} MiB {r['blocks']:8d} blocks", flush=True)
+
+    report = {
+        'machine': {'python': platform.python_version(), 'numpy': np.__version__,
+                    'platform': platform.platform(), 'processor': platform.processor()},
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            return compare_results(json.load(file), report, args.tolerance)
+    return 0
+
+def compare_results(baseline, current, tolerance=TOLERANCE):
+    '''
+    Prints how every case of `current` compares to `baseline`, and returns 1 if any case
+    is slower or uses more peak memory by more than `tolerance`, else 0.
+    '''
+    regressions = 0
+    for name, result in current['results'].items():
+        if name not in baseline['results']:
+            print(f'{name:50} new')
+            continue
+        base = baseline['results'][name]
+        time_ratio = result['time']/base['time']
+        memory_ratio = (result['peak_bytes'] + 1)/(base['peak_bytes'] + 1)
+        flags = []
+        if time_ratio > 1 + tolerance:
+            flags.append('SLOWER')
+        if memory_ratio > 1 + tolerance:
+            flags.append('MORE MEMORY')
+        regressions += bool(flags)
+        print(f"{name:50} time x{time_ratio:6.2f}  memory x{memory_ratio:6.2f}  {' '.join(flags)}")
+    print(f'{regressions} regressions (tolerance {tolerance:.0%}).')
+    return 1 if regressions else 0
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks of the numerical hot paths.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run the benchmarks')
+    run_parser.add_argument('-o', '--output', help='JSON file to write the results to')
+    run_parser.add_argument('-k', action='append', help='only run the cases whose name contains this (can be given more than once)')
+    run_parser.add_argument('--full', action='store_true', help='include the largest sizes (10^7 points, 2000^2 grids)')
+    run_parser.add_argument('--repeat', type=int, default=5, help='minimum number of timed runs per case')
+    run_parser.add_argument('--baseline', help='JSON results to compare with after running')
+    run_parser.add_argument('--tolerance', type=float, default=TOLERANCE)
+
+    compare_parser = commands.add_parser('compare', help='compare two JSON results')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--tolerance', type=float, default=TOLERANCE)
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        sys.exit(run(args))
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.current) as file:
+        current = json.load(file)
+    sys.exit(compare_results(baseline, current, args.tolerance))
+
+if __name__ == '__main__':
+    main()
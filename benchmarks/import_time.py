@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+# Copyright © 2021 Pim Nelissen.
+# This software is licensed under the MIT license.
+# Read more at https://mit-license.org/.
+
+import argparse
+import os
+import subprocess
+import sys
+
+'''
+Import-time benchmark.
+
+Every module below is imported in a fresh interpreter with `python -X importtime`, a number
+of times, and the fastest cumulative import time is compared with the budget. It also checks
+that none of the heavy plotting and fitting libraries is imported along with it, since those
+should only be imported by the code that uses them. E.g.
+
+    python3 benchmarks/import_time.py --budget 300
+
+exits with status 1 if any module is over the budget or imports a heavy library.
+'''
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+SWEEP_DIR = os.path.join(ROOT, 'FYSB21', 'Signal Analyzer Lab')
+
+# The modules to import, and the directory they are imported from.
+MODULES = {
+    'NUMA01': ROOT,
+    'NUMA01.homework_1_approximating_ln_x': ROOT,
+    'NUMA01.homework_2_classes_and_interval_arithmetic': ROOT,
+    'NUMA01.interval_search': ROOT,
+    'NUMA01.precise_ln': ROOT,
+    'MATB22.lin_algebra_project': ROOT,
+    'lu_work.render': ROOT,
+    'lu_work.instrument': ROOT,
+    'sweep_cache': SWEEP_DIR,
+    'sweep_fit': SWEEP_DIR,
+    'sweep_batch': SWEEP_DIR,
+}
+HEAVY = ['matplotlib', 'scipy', 'pandas', 'mpl_toolkits']
+BUDGET_MS = 500 # Default budget per module, in milliseconds. Most of it is the import of numpy.
+
+def import_time(module, path):
+    '''
+    Imports `module` from `path` in a new interpreter. Returns the cumulative import time in
+    milliseconds, and the heavy libraries that were imported along with it.
+    '''
+    code = f'import {module}'
+    # The top of the repository is on the path for lu_work, like when the scripts are run.
+    env = dict(os.environ, PYTHONPATH=os.path.abspath(ROOT))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=path, env=env,
+                            capture_output=True, text=True, check=True)
+    total = None
+    imported = set()
+    # Every line is 'import time: self [us] | cumulative | name', with the name indented by its depth.
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        name = name.strip()
+        imported.add(name.split('.')[0])
+        if name == module:
+            total = int(cumulative)/1000
+    return total, sorted(imported.intersection(HEAVY))
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures the time it takes to import every module.')
+    parser.add_argument('--budget', type=float, default=BUDGET_MS, help='budget per module in milliseconds')
+    parser.add_argument('--repeat', type=int, default=5, help='number of imports per module, of which the fastest counts')
+    args = parser.parse_args()
+
+    failed = False
+    for module, path in MODULES.items():
+        results = [import_time(module, path) for _ in range(args.repeat)]
+        best = min(total for total, _ in results)
+        heavy = results[0][1]
+        status = 'ok'
+        if best > args.budget:
+            status = 'over budget'
+        if heavy:
+            status = f"imports {', '.join(heavy)}"
+        failed |= status != 'ok'
+        print(f'{module:55} {best:8.1f} ms  {status}')
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == '__main__':
+    main()
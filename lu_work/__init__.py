@@ -0,0 +1,9 @@
+'''
+Shared helpers of the course code: rendering plots with or without a display (render), and
+opt-in instrumentation of the numerical code (instrument).
+
+The course packages import them from here (e.g. `from lu_work import render`), so the top of
+the repository must be on the Python path: run the NUMA01 and MATB22 scripts as modules from
+there (e.g. `python3 -m NUMA01.homework_1_approximating_ln_x`), and the FYSB21 lab scripts
+with it on the PYTHONPATH (e.g. `PYTHONPATH=../.. python3 rlc_plot.py`).
+'''
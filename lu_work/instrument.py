@@ -0,0 +1,167 @@
+#!/usr/bin/python3
+# Copyright © 2021 Pim Nelissen.
+# This software is licensed under the MIT license.
+# Read more at https://mit-license.org/.
+
+import functools
+import os
+import sys
+import threading
+import time
+
+'''
+Opt-in instrumentation of the numerical code.
+
+Functions report into a registry under the name of their call site (like 'approx_ln'):
+counters with count(), such as the number of iterations or function evaluations, and
+wall-time spans with span(), which time the block of a with statement, or with the
+timed() decorator, which times every call of a function. Nothing is recorded
+unless recording is switched on, either for a block of code
+
+    with instrument.recording():
+        approx_ln(x, 10)
+    instrument.report()
+
+or for the whole program with the environment variable INSTRUMENT=1, in which case the
+report is printed (to standard error) when the program exits. While recording is off,
+count() and timed functions return right away and span() returns a shared no-op context
+manager, so the hooks cost about one function call each.
+
+The registry is per process, so the workers of a process pool each have their own.
+'''
+
+_enabled = False
+_lock = threading.Lock()
+_counters = {} # {site: {name: total}}
+_spans = {} # {site: [number of spans, total seconds, longest seconds]}
+
+def enabled():
+    return _enabled
+
+def enable(on=True):
+    '''
+    Switches recording on (or off, with on=False). Returns whether it was on before.
+    '''
+    global _enabled
+    was, _enabled = _enabled, on
+    return was
+
+def count(site, name, value=1):
+    '''
+    Adds `value` to the counter `name` of `site`, if recording.
+    '''
+    if not _enabled:
+        return
+    with _lock:
+        counters = _counters.setdefault(site, {})
+        counters[name] = counters.get(name, 0) + value
+
+class _Span:
+    __slots__ = ('site', 'start')
+
+    def __init__(self, site):
+        self.site = site
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        with _lock:
+            span = _spans.setdefault(self.site, [0, 0.0, 0.0])
+            span[0] += 1
+            span[1] += elapsed
+            span[2] = max(span[2], elapsed)
+        return False
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NO_SPAN = _NoSpan()
+
+def span(site):
+    '''
+    Returns a context manager that adds the wall time of its block to the spans of `site`, if recording.
+    '''
+    return _Span(site) if _enabled else _NO_SPAN
+
+def timed(site):
+    '''
+    Decorator that records every call of the function as a span of `site`, if recording.
+    '''
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            with _Span(site):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def reset():
+    '''
+    Removes everything recorded so far.
+    '''
+    with _lock:
+        _counters.clear()
+        _spans.clear()
+
+def summary():
+    '''
+    Returns what was recorded, as {site: {'counters': {name: total}, 'calls': n, 'seconds': total, 'longest': seconds}}.
+    Sites without spans have no 'calls', 'seconds' and 'longest'.
+    '''
+    with _lock:
+        result = {site: {'counters': dict(counters)} for site, counters in _counters.items()}
+        for site, (calls, seconds, longest) in _spans.items():
+            result.setdefault(site, {'counters': {}}).update(calls=calls, seconds=seconds, longest=longest)
+    return result
+
+def report(file=None):
+    '''
+    Prints a summary per call site: the number of timed calls, their total and mean wall time,
+    and every counter with its total and its mean per call.
+    '''
+    file = file or sys.stdout
+    for site, entry in sorted(summary().items()):
+        calls = entry.get('calls')
+        if calls:
+            print(f"{site}: {calls} calls, {entry['seconds']*1000:.3f} ms in total, "
+                  f"{entry['seconds']/calls*1000:.3f} ms per call, {entry['longest']*1000:.3f} ms at most", file=file)
+        else:
+            print(f"{site}:", file=file)
+        for name, total in sorted(entry['counters'].items()):
+            mean = f" ({total/calls:.6g} per call)" if calls else ""
+            print(f"    {name}: {total:.6g}{mean}", file=file)
+
+class recording:
+    '''
+    Context manager that records (starting from an empty registry, unless keep=True) during its
+    block, and switches recording back to what it was afterwards. The registry is left as it
+    is, for summary() and report().
+    '''
+    def __init__(self, keep=False):
+        self.keep = keep
+
+    def __enter__(self):
+        if not self.keep:
+            reset()
+        self.was = enable()
+        return sys.modules[__name__]
+
+    def __exit__(self, *exc):
+        enable(self.was)
+        return False
+
+if os.environ.get('INSTRUMENT', '') not in ('', '0'):
+    import atexit
+    enable()
+    atexit.register(report, sys.stderr)
@@ -0,0 +1,133 @@
+#!/usr/bin/python3
+# Copyright © 2021 Pim Nelissen.
+# This software is licensed under the MIT license.
+# Read more at https://mit-license.org/.
+
+import importlib
+import os
+import sys
+import numpy as np
+
+'''
+Rendering of the plots of all scripts, with or without a display.
+
+When the environment variable RENDER_DIR is set, or there is no display to show plots on,
+matplotlib uses the Agg backend, and show() saves the figures to files in RENDER_DIR
+(default 'figures') in the format RENDER_FORMAT (default 'png', 'svg' and 'pdf' work too)
+instead of opening a window. E.g.
+
+    RENDER_DIR=out RENDER_FORMAT=svg python3 -m MATB22.lin_algebra_project
+
+plot() reduces a line to the resolution of the axes before drawing it: of the points that
+fall in one column of pixels, only the first, last, lowest and highest are drawn. For a line
+that looks the same as drawing every point (every peak is kept, and the line between them
+covers the rest of the column), but the time to draw depends on the width of the plot instead
+of the number of points. Scatter plots are drawn with plt.scatter() as they are, since there
+every point is seen on its own and leaving points out would change the plot.
+
+Importing this module does not import matplotlib yet. That only happens when a plot is
+made, through `pyplot` (use `from lu_work.render import pyplot as plt`), so that tasks and modules
+that do not plot do not pay for it. The backend is picked right before pyplot is imported,
+so pyplot should not be imported from matplotlib directly before that.
+'''
+
+RENDER_DIR = os.environ.get('RENDER_DIR')
+RENDER_FORMAT = os.environ.get('RENDER_FORMAT', 'png')
+
+def headless():
+    '''
+    Returns True if figures are saved to files instead of shown, which is the case if RENDER_DIR
+    is set, or if there is no display (on Linux, no DISPLAY or WAYLAND_DISPLAY).
+    '''
+    if RENDER_DIR:
+        return True
+    if sys.platform.startswith('linux'):
+        return not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+    return False
+
+def _import_pyplot():
+    if 'matplotlib.pyplot' not in sys.modules and headless() and 'MPLBACKEND' not in os.environ:
+        importlib.import_module('matplotlib').use('Agg')
+    return importlib.import_module('matplotlib.pyplot')
+
+class LazyModule:
+    '''
+    Stands in for a module that is only imported when one of its attributes is first used,
+    by calling `load`, which returns the module.
+    '''
+    def __init__(self, load):
+        self._load = load
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+pyplot = LazyModule(_import_pyplot)
+
+_saved = 0 # Number of figures saved so far, for figures without a name.
+
+def show(name=None):
+    '''
+    Shows all open figures like plt.show(), or when headless() saves them to RENDER_DIR as
+    `name`.RENDER_FORMAT (numbered if there is more than one figure) and closes them.
+    Returns the paths of the saved files.
+    '''
+    global _saved
+    plt = _import_pyplot()
+    if not headless():
+        plt.show()
+        return []
+
+    directory = RENDER_DIR or 'figures'
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    numbers = plt.get_fignums()
+    for number in numbers:
+        _saved += 1
+        stem = name or f'figure_{_saved}'
+        if len(numbers) > 1:
+            stem = f'{stem}_{number}'
+        path = os.path.join(directory, f'{stem}.{RENDER_FORMAT}')
+        plt.figure(number).savefig(path)
+        paths.append(path)
+    plt.close('all')
+    return paths
+
+def decimate(x, y, width):
+    '''
+    Reduces the points (x, y) to at most 4 per column, for `width` columns of equal width
+    over the range of x: the first, the last, the lowest and the highest point of the column,
+    in their original order. x must be sorted. Returns the remaining x and y as arrays.
+    '''
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    width = int(width)
+    if width < 1 or len(x) <= 4*width or x[-1] == x[0]:
+        return x, y
+
+    # The column of every point, and the index at which every column starts.
+    columns = ((x - x[0]) * (width/(x[-1] - x[0]))).astype(np.intp)
+    np.minimum(columns, width - 1, out=columns)
+    starts = np.flatnonzero(np.diff(columns, prepend=-1))
+    ends = np.append(starts[1:], len(x)) - 1
+    counts = ends - starts + 1
+
+    # The first index in every column at which y equals the minimum (maximum) of that column.
+    index = np.arange(len(y))
+    lowest = np.minimum.reduceat(np.where(y == np.repeat(np.minimum.reduceat(y, starts), counts), index, len(y)), starts)
+    highest = np.minimum.reduceat(np.where(y == np.repeat(np.maximum.reduceat(y, starts), counts), index, len(y)), starts)
+
+    keep = np.unique(np.concatenate([starts, ends, lowest, highest]))
+    keep = keep[keep < len(y)] # A column of only NaN has no lowest or highest point.
+    return x[keep], y[keep]
+
+def _columns(ax):
+    # The width of the axes in pixels.
+    return ax.get_window_extent().width
+
+def plot(x, y, *args, ax=None, **kwargs):
+    '''
+    Like plt.plot(x, y, ...), but draws only the points that decimate() keeps for the width of the axes.
+    '''
+    ax = ax or _import_pyplot().gca()
+    x, y = decimate(x, y, _columns(ax))
+    return ax.plot(x, y, *args, **kwargs)
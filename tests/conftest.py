@@ -0,0 +1,10 @@
+'''
+Puts the top of the repository on the Python path, so the tests can import the course packages
+(NUMA01, MATB22, lu_work) when they are run with plain `pytest` as well as with `python -m pytest`.
+The scripts of the signal analyzer lab are not a package, so their directory is put there as well.
+'''
+import os, sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'FYSB21', 'Signal Analyzer Lab'))
@@ -0,0 +1,51 @@
+import math
+import pytest
+from NUMA01 import Interval, IntervalArray, IntervalPolynomial, find_roots, find_minimum
+
+
+@pytest.mark.parametrize("batched", [False, True])
+@pytest.mark.parametrize("tol", [0, 1e-20])
+def test_find_roots_stops_at_one_float_wide_boxes(batched, tol):
+    # tol is below the spacing of the floats around sqrt(2), so the boxes can only get one float wide.
+    roots = find_roots(IntervalPolynomial([1,0,-2]), Interval(0,2), tol=tol, batched=batched)
+    assert len(roots) == 1
+    assert math.sqrt(2) in roots[0]
+    assert math.nextafter(roots[0].left, math.inf) >= roots[0].right
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_find_minimum_stops_at_one_float_wide_boxes(batched):
+    value, x = find_minimum(IntervalPolynomial([1,0]), Interval(0,1), tol=0, batched=batched)
+    assert 0 in value
+    assert 0 in x
+
+
+def test_even_powers_of_intervals_around_zero():
+    left, right = (Interval(-2,2)**2).left, (Interval(-2,2)**2).right
+    assert (left, right) == (0, 4)
+    squares = IntervalArray([-3,-3,1],[1,-1,2])**2
+    assert squares.left.tolist() == [0, 1, 1]
+    assert squares.right.tolist() == [9, 9, 4]
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_find_roots_of_function_with_even_power(batched):
+    roots = find_roots(lambda x: x**2-0.25, Interval(-1,1), tol=1e-10, batched=batched)
+    assert len(roots) == 2
+    assert -0.5 in roots[0]
+    assert 0.5 in roots[1]
+
+
+def test_in_operator_of_interval_array_points_to_contains():
+    intervals = IntervalArray([0,2],[1,3])
+    with pytest.raises(TypeError, match="contains"):
+        0.5 in intervals
+    assert intervals.contains(0.5).tolist() == [True, False]
+
+
+def test_fractional_power_of_negative_endpoints_is_refused():
+    with pytest.raises(ValueError):
+        Interval(-4,-1)**0.5
+    with pytest.raises(ValueError):
+        IntervalArray([-4,1],[-1,4])**0.5
+    assert (IntervalArray([1],[4])**0.5).right.tolist() == [2]
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from MATB22 import PowerIteration, iterates, solve_surface
+
+
+def test_power_iteration_of_defective_matrix():
+    # [[1,1],[0,1]] has only one eigenvector, so it cannot be diagonalized.
+    A, z_0 = np.array([[1,1],[0,1]]), np.array([0,1])
+    power_iteration = PowerIteration(A, z_0)
+    n = np.array([0,5,3,40])
+    expected = [np.linalg.matrix_power(A, k).dot(z_0) for k in n]
+    assert np.allclose(power_iteration.z(n), expected)
+    assert np.allclose(power_iteration.z(5), [5,1])
+
+
+def test_power_iteration_of_diagonalizable_matrix():
+    A, z_0 = np.array([[1,3,2],[-3,4,3],[2,3,1]]), np.array([8,3,12])
+    power_iteration = PowerIteration(A, z_0)
+    assert np.allclose(power_iteration.z(6), np.linalg.matrix_power(A, 6).dot(z_0))
+
+
+@pytest.mark.parametrize("rate", [False, True])
+def test_iterates_matches_linear_scan(rate):
+    power_iteration = PowerIteration([[1,3,2],[-3,4,3],[2,3,1]], [8,3,12])
+    v, epsilon = power_iteration.v(200), [1e-2,1e-6,1e-9,1e-12]
+    def linear_scan(eps):
+        n = 0
+        while np.linalg.norm(power_iteration.v(n) - v) >= eps:
+            n += 1
+        return n
+    expected = [linear_scan(eps) for eps in epsilon]
+    # depth=8 is too short for every epsilon, so the doubling or (with the rate) the extrapolation is used.
+    rate = power_iteration.rate if rate else None
+    assert iterates(power_iteration.v, v, epsilon, depth=8, rate=rate).tolist() == expected
+    assert [iterates(power_iteration.v, v, eps, depth=8, rate=rate) for eps in epsilon] == expected
+
+
+def test_solve_surface_of_linear_g():
+    # g is linear in x_3, but a is only 0 up to rounding, which must not give a root of q/a ~ 1e17.
+    X_1, X_2 = np.meshgrid(np.linspace(-1,1,20), np.linspace(-1,1,20))
+    for x_3 in solve_surface(lambda x_1, x_2, x_3: 3*x_3 + x_1 - 0.1*x_2, X_1, X_2):
+        assert np.allclose(x_3, -(X_1 - 0.1*X_2)/3)
+
+
+def test_solve_surface_without_real_root_gives_nan():
+    # exp(x_3) + x_1 = 0 only has a root, x_3 = ln(-x_1), where x_1 < 0.
+    X_1, X_2 = np.meshgrid(np.linspace(-1,1,20), np.linspace(-1,1,20))
+    for x_3 in solve_surface(lambda x_1, x_2, x_3: np.exp(x_3) + x_1, X_1, X_2):
+        assert np.all(np.isnan(x_3[X_1 >= 0]))
+        assert np.allclose(x_3[X_1 < 0], np.log(-X_1[X_1 < 0]))
+
+
+def test_solve_surface_finds_roots_past_a_minimum():
+    # x_3^3 + x_1 x_3 - x_2 always has a real root, but for x_1 < 0 |g| also has a minimum above 0 on the way there.
+    g = lambda x_1, x_2, x_3: x_3**3 + x_1*x_3 - x_2
+    X_1, X_2 = np.meshgrid(np.linspace(-1,1,20), np.linspace(-1,1,20))
+    for x_3 in solve_surface(g, X_1, X_2):
+        found = ~np.isnan(x_3)
+        assert np.mean(found) > 0.99
+        assert np.max(np.abs(g(X_1, X_2, x_3)[found])) < 1e-9
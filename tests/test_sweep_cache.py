@@ -0,0 +1,18 @@
+import os, shutil
+from conftest import ROOT
+from sweep_cache import INDEX_EXTENSION, load_sweep
+
+DATA = os.path.join(ROOT, 'FYSB21', 'Signal Analyzer Lab', 'data')
+
+
+def test_evict_removes_index_entries_of_evicted_sweeps(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    for name in sorted(os.listdir(DATA)):
+        shutil.copy(os.path.join(DATA, name), tmp_path)
+        # Nothing fits in the cache, so every store evicts all but the sweep that was just stored.
+        header, freq, gain = load_sweep(str(tmp_path / name), cache_dir, max_bytes=0)
+
+    names = os.listdir(cache_dir)
+    assert sorted(os.path.splitext(name)[1] for name in names) == sorted(['.npy', '.json', INDEX_EXTENSION])
+    cached = load_sweep(str(tmp_path / name), cache_dir, max_bytes=0)
+    assert (cached[1] == freq).all() and (cached[2] == gain).all()
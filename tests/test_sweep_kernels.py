@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+from sweep_kernels import dbm_to_linear, linear_to_dbm, normalize, rlc_response
+
+R, L, C = 50, 1e-3, 1e-9
+
+KERNELS = [
+    (dbm_to_linear, lambda x: 10**(x/10), np.linspace(-60, 10, 50)),
+    (linear_to_dbm, lambda x: 10*np.log10(x), np.logspace(-6, 1, 50)),
+    (normalize, lambda x: x/np.max(x), np.logspace(-6, 1, 50)),
+    (lambda x, out=None: rlc_response(x, R, L, C, out=out),
+     lambda x: 1/np.sqrt(1 + (1/R**2)*(1/(x*C) - L*x)**2), np.linspace(1e5, 1e7, 50)),
+]
+
+
+@pytest.mark.parametrize("kernel, formula, x", KERNELS)
+def test_kernel_without_out(kernel, formula, x):
+    assert np.allclose(kernel(x), formula(x), rtol=1e-12, atol=0)
+
+
+@pytest.mark.parametrize("kernel, formula, x", KERNELS)
+def test_kernel_with_out(kernel, formula, x):
+    out = np.empty_like(x)
+    assert kernel(x, out=out) is out
+    assert np.allclose(out, formula(x), rtol=1e-12, atol=0)
+
+
+@pytest.mark.parametrize("kernel, formula, x", KERNELS)
+def test_kernel_with_out_as_input(kernel, formula, x):
+    buffer = x.copy()
+    assert kernel(buffer, out=buffer) is buffer
+    assert np.allclose(buffer, formula(x), rtol=1e-12, atol=0)